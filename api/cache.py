@@ -0,0 +1,78 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from title.models import Title
+
+
+def _get_cache():
+    return caches[settings.TITLE_CARD_CACHE]
+
+
+def _version_key(title_id):
+    return f'title:version:{title_id}'
+
+
+def bump_title_versions(title_ids):
+    """
+    Сбрасывает версии карточек произведений. При следующем чтении
+    будет создана новая версия, и карточки сериализуются заново.
+    Внутри транзакции версии сбрасываются после COMMIT: иначе читатель
+    успел бы сохранить под новой версией карточку без изменений.
+    title_ids (в том числе queryset) читаются сразу.
+    """
+    keys = [_version_key(title_id) for title_id in title_ids]
+    if keys:
+        transaction.on_commit(lambda: _get_cache().delete_many(keys))
+
+
+def _get_versions(cache, title_ids):
+    keys = {title_id: _version_key(title_id) for title_id in title_ids}
+    versions = cache.get_many(keys.values())
+    new_versions = {
+        key: uuid4().hex for key in keys.values() if key not in versions
+    }
+    if new_versions:
+        cache.set_many(new_versions, None)
+        versions.update(new_versions)
+    return {title_id: versions[key] for title_id, key in keys.items()}
+
+
+def get_title_cards(title_ids):
+    """
+    Возвращает сериализованные произведения (карточки) в порядке title_ids.
+    Карточки читаются из кэша одним get_many по ключу id:версия;
+    отсутствующие или устаревшие загружаются запросом произведений
+    и запросом id их жанров (жанры и категории берутся из title.lookups),
+    сериализуются и сохраняются в кэш. Несуществующие id пропускаются.
+    """
+    from .serializers import TitleSerializer
+
+    cache = _get_cache()
+    versions = _get_versions(cache, title_ids)
+    keys = {
+        title_id: f'title:card:{title_id}:{version}'
+        for title_id, version in versions.items()
+    }
+    cards = cache.get_many(keys.values())
+    missing = [
+        title_id for title_id, key in keys.items() if key not in cards
+    ]
+    if missing:
+        titles = list(Title.objects.filter(id__in=missing))
+        genre_ids = {title.id: [] for title in titles}
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=genre_ids
+        ).values_list('title_id', 'genre_id'):
+            genre_ids[title_id].append(genre_id)
+        for title in titles:
+            title.genre_ids = genre_ids[title.id]
+        fresh = {
+            keys[title.id]: TitleSerializer(title).data for title in titles
+        }
+        cache.set_many(fresh, settings.TITLE_CARD_TIMEOUT)
+        cards.update(fresh)
+    return [cards[keys[title_id]] for title_id in title_ids
+            if keys[title_id] in cards]
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Кэши, состояние в которых должно быть общим для всех воркеров.
+SHARED_CACHE_SETTINGS = (
+    'CONFIRMATION_CODE_CACHE',
+    'TITLE_CARD_CACHE',
+    'LOOKUP_CACHE',
+    'RECOMMENDATIONS_CACHE',
+)
+
+# Бэкенды, которые хранят данные в памяти одного процесса или не хранят.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Предупреждает, если кэш из SHARED_CACHE_SETTINGS не общий
+    для воркеров: например, код подтверждения, выданный одним воркером,
+    не найдется на другом, а сброс версии карточки произведения
+    не увидят остальные воркеры (для таблиц жанров и категорий это
+    стоит лишних запросов к базе), а рекомендации на других воркерах
+    до RECOMMENDATIONS_TIMEOUT будут включать уже оцененные произведения.
+    """
+    names_by_alias = {}
+    for name in SHARED_CACHE_SETTINGS:
+        names_by_alias.setdefault(getattr(settings, name), []).append(name)
+    warnings = []
+    for alias, names in names_by_alias.items():
+        backend = settings.CACHES[alias]['BACKEND']
+        if backend in LOCAL_CACHE_BACKENDS:
+            warnings.append(Warning(
+                f'Кэш {alias!r} ({", ".join(names)}) использует бэкенд '
+                f'{backend}, который не общий для воркеров.',
+                hint='Для нескольких воркеров задайте CACHE_BACKEND '
+                     '(например, Redis или Memcached).',
+                id='api.W001',
+            ))
+    return warnings
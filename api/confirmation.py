@@ -0,0 +1,54 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare
+
+
+def _get_cache():
+    return caches[settings.CONFIRMATION_CODE_CACHE]
+
+
+def _get_key(email):
+    digest = hashlib.sha256(email.lower().encode()).hexdigest()
+    return f'confirmation_code:{digest}'
+
+
+def issue_code(email):
+    """
+    Создает код подтверждения для email и сохраняет его в кэше
+    на CONFIRMATION_CODE_TTL секунд. Новый код заменяет прежний.
+    """
+    code = secrets.token_urlsafe(16)
+    _get_cache().set(
+        _get_key(email), code, settings.CONFIRMATION_CODE_TTL
+    )
+    return code
+
+
+def check_code(email, code):
+    """
+    Проверяет код подтверждения, не расходуя его.
+    """
+    stored = _get_cache().get(_get_key(email))
+    return stored is not None and constant_time_compare(stored, code)
+
+
+def consume_code(email, code):
+    """
+    Расходует верный код подтверждения: код можно использовать только
+    один раз. Код отмечается использованным атомарным cache.add(),
+    и из двух одновременных запросов с ним проходит только один.
+    Возвращает True, если код был верным и не использованным.
+    """
+    cache = _get_cache()
+    key = _get_key(email)
+    stored = cache.get(key)
+    if stored is None or not constant_time_compare(stored, code):
+        return False
+    used_key = f'{key}:used:{hashlib.sha256(stored.encode()).hexdigest()}'
+    if not cache.add(used_key, True, settings.CONFIRMATION_CODE_TTL):
+        return False
+    cache.delete(key)
+    return True
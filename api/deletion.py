@@ -0,0 +1,139 @@
+from django.db import connection, transaction
+
+from change.models import Change
+from comment.models import Comment
+from comment.threads import with_replies
+from review.models import Review, ReviewVote, ReviewVoteShard
+from review.votes import remove_user_votes
+from .cache import bump_title_versions
+from .ratings import schedule_rating_update
+
+DELETE_CHUNK_SIZE = 500
+
+
+def _delete_ids(model, ids):
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {pk} IN ({placeholders})', ids
+        )
+        return cursor.rowcount
+
+
+def delete_in_chunks(queryset, chunk_size=DELETE_CHUNK_SIZE, progress=None):
+    """
+    Удаляет объекты queryset пакетами по chunk_size сырыми DELETE.
+    В память загружаются только id одного пакета, сигналы не вызываются,
+    удаления записываются в журнал изменений пакетом.
+    Каждый пакет удаляется в отдельной транзакции, чтобы не держать
+    блокировку на всё время удаления.
+    progress(model, deleted) вызывается после каждого пакета
+    с общим количеством удаленных объектов.
+    Явная сортировка queryset сохраняется (например, комментарии
+    удаляются по убыванию path, чтобы ответы удалялись раньше
+    комментариев, на которые они отвечают).
+    """
+    model = queryset.model
+    ids_queryset = queryset.order_by(
+        *queryset.query.order_by
+    ).values_list('pk', flat=True)
+    deleted = 0
+    while True:
+        ids = list(ids_queryset[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += _delete_ids(model, ids)
+            Change.record_deleted(model, ids)
+        if progress is not None:
+            progress(model, deleted)
+
+
+def _delete_with_dependents(obj, querysets, chunk_size, progress):
+    counts = {}
+    for queryset in querysets:
+        label = queryset.model._meta.label
+        counts[label] = counts.get(label, 0) + delete_in_chunks(
+            queryset, chunk_size, progress
+        )
+    obj.delete()
+    label = obj._meta.label
+    counts[label] = counts.get(label, 0) + 1
+    return counts
+
+
+def delete_title(title, chunk_size=DELETE_CHUNK_SIZE, progress=None):
+    """
+    Удаляет произведение вместе с отзывами, голосами и комментариями к нему.
+    Возвращает словарь {модель: количество удаленных объектов}.
+    """
+    return _delete_with_dependents(title, (
+        Comment.objects.filter(title=title).order_by('-path'),
+        Comment.objects.filter(review__title=title).order_by('-path'),
+        ReviewVote.objects.filter(review__title=title),
+        ReviewVoteShard.objects.filter(review__title=title),
+        Review.objects.filter(title=title),
+    ), chunk_size, progress)
+
+
+def delete_review(review, chunk_size=DELETE_CHUNK_SIZE, progress=None):
+    """
+    Удаляет отзыв вместе с комментариями и голосами.
+    """
+    return _delete_with_dependents(review, (
+        Comment.objects.filter(review=review).order_by('-path'),
+        ReviewVote.objects.filter(review=review),
+        ReviewVoteShard.objects.filter(review=review),
+    ), chunk_size, progress)
+
+
+def delete_user(user, chunk_size=DELETE_CHUNK_SIZE, progress=None):
+    """
+    Удаляет пользователя вместе с его отзывами, комментариями
+    (с ответами на них), голосами и комментариями и голосами других
+    пользователей к его отзывам. Счетчики голосов отзывов, за которые
+    голосовал пользователь, уменьшаются.
+    Пересчитывает рейтинг произведений, к которым были отзывы
+    пользователя, и сбрасывает кэш их карточек.
+    """
+    title_ids = list(
+        Review.objects.filter(author=user).values_list(
+            'title_id', flat=True
+        ).distinct()
+    )
+    removed_votes = remove_user_votes(user, chunk_size)
+    counts = _delete_with_dependents(user, (
+        *with_replies(Comment.objects.filter(author=user)),
+        Comment.objects.filter(review__author=user).order_by('-path'),
+        ReviewVote.objects.filter(review__author=user),
+        ReviewVoteShard.objects.filter(review__author=user),
+        Review.objects.filter(author=user),
+    ), chunk_size, progress)
+    label = ReviewVote._meta.label
+    counts[label] = counts.get(label, 0) + removed_votes
+    schedule_rating_update(title_ids)
+    bump_title_versions(title_ids)
+    return counts
+
+
+def bulk_delete_action(delete_object, description):
+    """
+    Создает действие админки, удаляющее выбранные объекты
+    через delete_object (delete_title, delete_user, ...).
+    По завершении сообщает количество удаленных объектов каждой модели.
+    """
+
+    def action(modeladmin, request, queryset):
+        totals = {}
+        for obj in queryset.iterator():
+            for label, count in delete_object(obj).items():
+                totals[label] = totals.get(label, 0) + count
+        modeladmin.message_user(request, 'Удалено: ' + ', '.join(
+            f'{label} - {count}' for label, count in totals.items()
+        ))
+
+    action.__name__ = f'{delete_object.__name__}_in_chunks'
+    action.short_description = description
+    return action
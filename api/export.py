@@ -0,0 +1,113 @@
+import csv
+import json
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from comment.models import Comment
+from review.models import Review
+from title.models import Category, Genre, Title
+from user.models import User
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Наборы данных для выгрузки: имя - (queryset, ((заголовок, поле), ...)).
+# Заголовки совпадают со схемами файлов data/*.csv.
+EXPORT_DATASETS = {
+    'category': (
+        lambda: Category.objects.order_by('id'),
+        (('id', 'id'), ('name', 'name'), ('slug', 'slug')),
+    ),
+    'genre': (
+        lambda: Genre.objects.order_by('id'),
+        (('id', 'id'), ('name', 'name'), ('slug', 'slug')),
+    ),
+    'titles': (
+        lambda: Title.objects.order_by('id'),
+        (('id', 'id'), ('name', 'name'), ('year', 'year'),
+         ('description', 'description'), ('category', 'category_id'),
+         ('rating', 'rating')),
+    ),
+    'genre_title': (
+        lambda: Title.genre.through.objects.order_by('id'),
+        (('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id')),
+    ),
+    'review': (
+        lambda: Review.objects.order_by('id'),
+        (('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+         ('author_id', 'author_id'), ('score', 'score'),
+         ('pub_date', 'pub_date')),
+    ),
+    'comments': (
+        lambda: Comment.objects.order_by('id'),
+        (('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+         ('author', 'author_id'), ('pub_date', 'pub_date')),
+    ),
+    'users': (
+        lambda: User.objects.order_by('id'),
+        (('id', 'id'), ('username', 'username'), ('email', 'email'),
+         ('role', 'role'), ('description', 'bio'),
+         ('first_name', 'first_name'), ('last_name', 'last_name')),
+    ),
+}
+
+
+class Echo:
+    """
+    Псевдо-буфер для csv.writer: возвращает записанную строку,
+    вместо того чтобы накапливать её.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _iter_rows(dataset):
+    get_queryset, columns = EXPORT_DATASETS[dataset]
+    headers = [header for header, _ in columns]
+    fields = [field for _, field in columns]
+    rows = get_queryset().values_list(*fields).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    return headers, rows
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return DjangoJSONEncoder().default(value)
+    return value
+
+
+def iter_csv(dataset):
+    """
+    Построчно выгружает набор данных в CSV с заголовком.
+    """
+    headers, rows = _iter_rows(dataset)
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_format_value(value) for value in row])
+
+
+def iter_ndjson(dataset):
+    """
+    Построчно выгружает набор данных в NDJSON - один объект на строку.
+    """
+    headers, rows = _iter_rows(dataset)
+    for row in rows:
+        yield json.dumps(
+            dict(zip(headers, row)),
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False
+        ) + '\n'
+
+
+def iter_export(dataset, export_format):
+    if export_format == 'csv':
+        return iter_csv(dataset)
+    return iter_ndjson(dataset)
@@ -0,0 +1,173 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from change.models import Change, ChangeActions
+from title.lookups import categories, genres
+from title.models import Title
+
+# При большем количестве новых записей журнала индекс строится заново.
+FULL_RELOAD_CHANGES = 1000
+
+
+def bitmap_from_ids(ids):
+    """
+    Битовая маска множества id: бит с номером id установлен.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for pk in ids:
+        data[pk >> 3] |= 1 << (pk & 7)
+    return int.from_bytes(data, 'little')
+
+
+def bitmap_count(bitmap):
+    return bin(bitmap).count('1')
+
+
+class GenreBitmapIndex:
+    """
+    Принадлежность произведений жанрам в памяти процесса:
+    для каждого id жанра - битовая маска id произведений.
+    Индекс обновляется по журналу изменений (change.Change):
+    для произведений, измененных после последней прочитанной записи
+    (в том числе изменения жанров через M2M), перечитываются только
+    их связи с жанрами; удаленные жанры убираются из индекса.
+    Так индекс согласован между воркерами без общего кэша.
+    Записи моложе settings.CHANGES_COMMIT_LAG секунд применяются,
+    но перечитываются при следующем обновлении: до них могут быть
+    зафиксированы записи с меньшими номерами.
+    """
+
+    def __init__(self):
+        self._bitmaps = {}
+        self._last_change = None
+
+    def _settled(self):
+        return timezone.now() - timedelta(seconds=settings.CHANGES_COMMIT_LAG)
+
+    def _reload(self):
+        last_change = Change.objects.filter(
+            created__lte=self._settled()
+        ).aggregate(last=Max('id'))['last'] or 0
+        title_ids = {}
+        for title_id, genre_id in Title.genre.through.objects.values_list(
+            'title_id', 'genre_id'
+        ).iterator():
+            title_ids.setdefault(genre_id, []).append(title_id)
+        self._bitmaps = {
+            genre_id: bitmap_from_ids(ids)
+            for genre_id, ids in title_ids.items()
+        }
+        self._last_change = last_change
+
+    def _apply_changes(self, changes):
+        """
+        Строит новый словарь масок и подменяет его одним присваиванием:
+        get_facets() в другом потоке может в это время обходить прежний.
+        """
+        bitmaps = dict(self._bitmaps)
+        title_ids = set()
+        for model, object_id, action in changes:
+            if model == 'genre' and action == ChangeActions.DELETE:
+                bitmaps.pop(object_id, None)
+            elif model == 'title':
+                title_ids.add(object_id)
+        if title_ids:
+            mask = bitmap_from_ids(title_ids)
+            bitmaps = {
+                genre_id: bitmap & ~mask
+                for genre_id, bitmap in bitmaps.items()
+            }
+            for title_id, genre_id in Title.genre.through.objects.filter(
+                title_id__in=title_ids
+            ).values_list('title_id', 'genre_id'):
+                bitmaps[genre_id] = bitmaps.get(genre_id, 0) | (1 << title_id)
+        self._bitmaps = bitmaps
+
+    def refresh(self):
+        """
+        Применяет новые записи журнала изменений; при первом вызове
+        или большом количестве изменений строит индекс заново.
+        """
+        if self._last_change is None:
+            return self._reload()
+        settled = self._settled()
+        changes = list(Change.objects.filter(
+            id__gt=self._last_change, model__in=('title', 'genre')
+        ).values_list('id', 'model', 'object_id', 'action', 'created')[
+            :FULL_RELOAD_CHANGES + 1
+        ])
+        if len(changes) > FULL_RELOAD_CHANGES:
+            return self._reload()
+        if changes:
+            self._apply_changes(
+                (model, object_id, action)
+                for _, model, object_id, action, _ in changes
+            )
+            for pk, _, _, _, created in changes:
+                if created > settled:
+                    break
+                self._last_change = pk
+
+    def get_bitmaps(self):
+        self.refresh()
+        return self._bitmaps
+
+    def invalidate(self):
+        """
+        Сбрасывает индекс: при следующем обращении он строится заново.
+        """
+        self._bitmaps = {}
+        self._last_change = None
+
+
+genre_bitmaps = GenreBitmapIndex()
+
+
+def _lookup_facets(lookup_table, counts):
+    facets = []
+    for pk, count in counts.items():
+        obj = lookup_table.get_by_id(pk)
+        if obj is not None and count:
+            facets.append({'name': obj.name, 'slug': obj.slug, 'count': count})
+    return sorted(facets, key=lambda facet: facet['slug'])
+
+
+def get_facets(queryset):
+    """
+    Количество произведений queryset по жанрам, категориям и десятилетиям.
+    Произведения читаются одним запросом (id, category_id, year),
+    категории и десятилетия считаются за один проход по строкам,
+    жанры - пересечением маски найденных id с масками жанров из индекса.
+    """
+    bitmaps = genre_bitmaps.get_bitmaps()
+    ids = []
+    category_counts = Counter()
+    decade_counts = Counter()
+    for pk, category_id, year in queryset.order_by().values_list(
+        'id', 'category_id', 'year'
+    ).iterator():
+        ids.append(pk)
+        if category_id is not None:
+            category_counts[category_id] += 1
+        decade_counts[year - year % 10] += 1
+    mask = bitmap_from_ids(ids)
+    genre_counts = {
+        genre_id: bitmap_count(bitmap & mask)
+        for genre_id, bitmap in bitmaps.items()
+    }
+    return {
+        'count': len(ids),
+        'genre': _lookup_facets(genres, genre_counts),
+        'category': _lookup_facets(categories, category_counts),
+        'decade': [
+            {'decade': decade, 'count': count}
+            for decade, count in sorted(decade_counts.items())
+        ],
+    }
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.similarity import build_similar_titles
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает похожие произведения по оценкам отзывов '
+        '(для /api/v1/titles/{id}/similar/).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=settings.SIMILAR_TITLES_TOP_K,
+            help='Сколько похожих произведений хранить для произведения.'
+        )
+        parser.add_argument(
+            '--min-common',
+            type=int,
+            default=settings.SIMILAR_TITLES_MIN_COMMON,
+            help='Минимальное число пользователей, оценивших оба произведения.'
+        )
+        parser.add_argument(
+            '--max-reviews',
+            type=int,
+            default=settings.SIMILAR_TITLES_MAX_USER_REVIEWS,
+            help='Сколько последних отзывов пользователя учитывать.'
+        )
+
+    def handle(self, *args, **options):
+        count = build_similar_titles(
+            options['top_k'], options['min_common'], options['max_reviews']
+        )
+        self.stdout.write(f'Сохранено пар похожих произведений: {count}')
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Min
+
+from api.deletion import delete_review
+from review.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Находит повторные отзывы одного автора к одному произведению '
+        '(мешают миграции review 0013). С --delete удаляет все, кроме '
+        'первого, вместе с комментариями и голосами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Удалить повторные отзывы, а не только показать их.'
+        )
+
+    def handle(self, *args, **options):
+        duplicates = Review.objects.filter(
+            author__isnull=False, title__isnull=False
+        ).order_by().values('author_id', 'title_id').annotate(
+            first=Min('id'), total=Count('id')
+        ).filter(total__gt=1)
+        deleted = 0
+        for duplicate in list(duplicates):
+            extra = list(Review.objects.filter(
+                author_id=duplicate['author_id'],
+                title_id=duplicate['title_id'],
+            ).exclude(id=duplicate['first']).order_by('id'))
+            extra_ids = ', '.join(str(review.pk) for review in extra)
+            self.stdout.write(
+                f'Автор {duplicate["author_id"]}, произведение '
+                f'{duplicate["title_id"]}: оставлен отзыв '
+                f'{duplicate["first"]}, повторные - {extra_ids}'
+            )
+            if options['delete']:
+                for review in extra:
+                    delete_review(review)
+                    deleted += 1
+        if options['delete']:
+            self.stdout.write(f'Удалено повторных отзывов: {deleted}')
@@ -0,0 +1,48 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import EXPORT_DATASETS, EXPORT_FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковая выгрузка каталога в NDJSON или CSV '
+        '(схемы совпадают с data/*.csv).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            help='Наборы данных: ' + ', '.join(EXPORT_DATASETS)
+                 + '. По умолчанию - все.'
+        )
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=tuple(EXPORT_FORMATS),
+            default='ndjson'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default='.',
+            help='Каталог, в который будут записаны файлы <набор>.<формат>.'
+        )
+
+    def handle(self, *args, **options):
+        datasets = options['datasets'] or list(EXPORT_DATASETS)
+        unknown = set(datasets) - set(EXPORT_DATASETS)
+        if unknown:
+            raise CommandError(
+                'Неизвестные наборы данных: ' + ', '.join(sorted(unknown))
+            )
+        export_format = options['export_format']
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for dataset in datasets:
+            path = os.path.join(
+                options['output_dir'], f'{dataset}.{export_format}'
+            )
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                file.writelines(iter_export(dataset, export_format))
+            self.stdout.write(f'{dataset}: {path}')
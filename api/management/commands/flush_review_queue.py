@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.review_queue import flush_reviews
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит отзывы из очереди отложенной записи в базу пакетами '
+        '(settings.REVIEW_WRITE_BEHIND).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.REVIEW_QUEUE_BATCH_SIZE,
+            help='Сколько отзывов переносить в одной транзакции.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Если больше нуля - работать постоянно, проверяя очередь '
+                 'с этим интервалом в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed, created = flush_reviews(options['batch_size'])
+            if processed:
+                self.stdout.write(
+                    f'Обработано записей: {processed}, '
+                    f'создано отзывов: {created}'
+                )
+                continue
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
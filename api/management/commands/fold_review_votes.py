@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from review.votes import fold_vote_shards
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит части счетчиков голосов в Review.helpful_count '
+        '(settings.REVIEW_VOTE_SHARDS больше 1).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Если больше нуля - работать постоянно, перенося счетчики '
+                 'с этим интервалом в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            folded = fold_vote_shards()
+            if folded:
+                self.stdout.write(f'Перенесено частей счетчиков: {folded}')
+            if folded >= settings.REVIEW_VOTE_FOLD_BATCH_SIZE:
+                continue
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
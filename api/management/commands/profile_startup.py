@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PACKAGES = (
+    'title',
+    'review',
+    'comment',
+    'user',
+    'change',
+    'api',
+    'rest_framework',
+    'rest_framework_simplejwt',
+    'django_filters',
+    'django.contrib.admin',
+    'django',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер запуска воркера в новом процессе: время импорта приложений '
+        'и библиотек, компиляции URL-шаблонов и первого запроса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            default='/api/v1/titles/',
+            help='Адрес первого запроса.'
+        )
+        parser.add_argument(
+            '--settings-module',
+            default=os.environ.get('DJANGO_SETTINGS_MODULE'),
+            help='Модуль настроек воркера.'
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        env['DJANGO_SETTINGS_MODULE'] = options['settings_module']
+        result = subprocess.run(
+            [sys.executable, '-m', 'api_yamdb.startup', options['url'],
+             *PACKAGES],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+        profile = json.loads(result.stdout)
+        self.stdout.write('Импорт пакетов (собственное время), ms:')
+        for package, total in profile['imports'].items():
+            self.stdout.write(f'  {package:<28}{total:>10.2f}')
+        self.stdout.write('Запуск, ms:')
+        for name, value in profile['timings'].items():
+            self.stdout.write(f'  {name:<48}{value:>10.2f}')
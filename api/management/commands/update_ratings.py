@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.ratings import update_dirty_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг произведений, отмеченных при изменении '
+        'отзывов (settings.RATING_UPDATE_MODE = deferred).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Если больше нуля - работать постоянно, проверяя отметки '
+                 'с этим интервалом в секундах. Интервал должен быть '
+                 'меньше RATING_MAX_STALENESS.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            updated = update_dirty_ratings()
+            if updated:
+                self.stdout.write(f'Пересчитано произведений: {updated}')
+            if updated >= settings.RATING_BATCH_SIZE:
+                continue
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Пагинация по ключу id: следующая страница запрашивается
+    с параметром `after` - id последнего объекта текущей страницы.
+    Каждая страница читается диапазоном по первичному ключу, без OFFSET,
+    поэтому время не зависит от номера страницы.
+    Поле count вычисляется только для первой страницы,
+    на следующих оно равно null, ссылки на предыдущую страницу нет.
+    Запрос с номером страницы `page` без `after` обрабатывается
+    как в PageNumberPagination (с OFFSET), чтобы прежние клиенты
+    продолжали работать.
+    """
+    page_size = api_settings.PAGE_SIZE
+    after_query_param = 'after'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        after = request.query_params.get(self.after_query_param)
+        self.keyset = (
+            after is not None
+            or self.page_query_param not in request.query_params
+        )
+        if not self.keyset:
+            return super().paginate_queryset(
+                queryset.order_by('id'), request, view
+            )
+        if after is None:
+            self.count = queryset.count()
+        else:
+            try:
+                after = int(after)
+            except ValueError:
+                raise ValidationError(
+                    {self.after_query_param: 'Должно быть целым числом.'}
+                )
+            self.count = None
+            queryset = queryset.filter(id__gt=after)
+        page = list(queryset.order_by('id')[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.last_id = self._get_id(page[-1]) if page else None
+        return page
+
+    @staticmethod
+    def _get_id(item):
+        return item['id'] if isinstance(item, dict) else item.pk
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.after_query_param, self.last_id)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', None),
+            ('results', data),
+        ]))
+
+
+class HistoryCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация истории пользователя (отзывы, комментарии)
+    от новых к старым. Страница читается диапазоном по индексу
+    (author, -pub_date, -id), поэтому время не зависит от количества
+    записей пользователя и номера страницы.
+    """
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('-pub_date', '-id')
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from review.models import Review
+from title.models import DirtyTitle, Title
+from .cache import bump_title_versions
+
+
+def update_title_ratings(title_ids):
+    """
+    Пересчитывает хранимый рейтинг произведений title_ids
+    одним UPDATE с подзапросом средней оценки отзывов.
+    Сигналы модели Title не вызываются.
+    """
+    title_ids = [title_id for title_id in set(title_ids) if title_id]
+    if not title_ids:
+        return
+    average = Review.objects.filter(
+        title_id=OuterRef('pk')
+    ).order_by().values('title_id').annotate(
+        average=Avg('score')
+    ).values('average')
+    Title.objects.filter(id__in=title_ids).update(
+        rating=Subquery(average)
+    )
+
+
+def mark_titles_dirty(title_ids):
+    """
+    Отмечает рейтинг произведений устаревшим. Первая отметка
+    после пересчета сохраняет first_marked, последующие
+    сдвигают только last_marked.
+    """
+    title_ids = {title_id for title_id in title_ids if title_id}
+    if not title_ids:
+        return
+    now = timezone.now()
+    DirtyTitle.objects.bulk_create((
+        DirtyTitle(title_id=title_id, first_marked=now, last_marked=now)
+        for title_id in title_ids
+    ), ignore_conflicts=True)
+    DirtyTitle.objects.filter(title_id__in=title_ids).update(last_marked=now)
+
+
+def schedule_rating_update(title_ids):
+    """
+    Пересчитывает рейтинг произведений сразу (RATING_UPDATE_MODE = 'sync')
+    или отмечает их для пересчета командой update_ratings ('deferred').
+    """
+    if settings.RATING_UPDATE_MODE == 'deferred':
+        mark_titles_dirty(title_ids)
+    else:
+        update_title_ratings(title_ids)
+
+
+def update_dirty_ratings(now=None, batch_size=None):
+    """
+    Пересчитывает рейтинг отмеченных произведений, к которым
+    отзывы не менялись RATING_DEBOUNCE секунд или которые ждут
+    дольше RATING_MAX_STALENESS секунд, одним UPDATE на пакет.
+    Удаляются только прочитанные отметки (last_marked не позже самой
+    поздней из прочитанных), поэтому отметки, сделанные во время
+    пересчета, сохраняются независимо от переданного now.
+    Возвращает количество пересчитанных произведений.
+    """
+    if now is None:
+        now = timezone.now()
+    if batch_size is None:
+        batch_size = settings.RATING_BATCH_SIZE
+    marks = list(DirtyTitle.objects.filter(
+        Q(last_marked__lte=now - timedelta(seconds=settings.RATING_DEBOUNCE))
+        | Q(first_marked__lte=now - timedelta(
+            seconds=settings.RATING_MAX_STALENESS
+        ))
+    ).order_by('first_marked').values_list('title_id', 'last_marked')[
+        :batch_size
+    ])
+    if not marks:
+        return 0
+    title_ids = [title_id for title_id, _ in marks]
+    update_title_ratings(title_ids)
+    DirtyTitle.objects.filter(
+        title_id__in=title_ids,
+        last_marked__lte=max(last_marked for _, last_marked in marks)
+    ).delete()
+    bump_title_versions(title_ids)
+    return len(title_ids)
@@ -0,0 +1,102 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+
+from review.models import Review
+from title.models import SimilarTitle
+
+VERSION_KEY = 'recommendations:version'
+
+
+def _get_cache():
+    return caches[settings.RECOMMENDATIONS_CACHE]
+
+
+def _user_key(cache, user_id):
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return f'recommendations:{version}:{user_id}'
+
+
+def _add_neighbours(state, rows):
+    rated, scores = state['rated'], state['scores']
+    for title_id, similar_id, similarity in rows:
+        if similar_id in rated:
+            continue
+        total = scores.setdefault(similar_id, [0.0, 0.0])
+        total[0] += similarity * rated[title_id]
+        total[1] += similarity
+
+
+def _build_state(user_id):
+    rated = dict(Review.objects.filter(
+        author_id=user_id, title__isnull=False
+    ).values_list('title_id', 'score'))
+    state = {'rated': rated, 'scores': {}}
+    _add_neighbours(state, SimilarTitle.objects.filter(
+        title_id__in=rated
+    ).values_list('title_id', 'similar_id', 'score'))
+    return state
+
+
+def get_recommendations(user_id, limit=None):
+    """
+    id произведений, рекомендованных пользователю, по убыванию
+    ожидаемой оценки. Ожидаемая оценка непросмотренного произведения -
+    среднее оценок пользователя, взвешенное по сходству с оцененными
+    произведениями (соседи из SimilarTitle, api.similarity).
+    Состояние расчета (оценки пользователя и суммы по кандидатам)
+    хранится в кэше, поэтому повторный запрос не обращается к базе.
+    """
+    if limit is None:
+        limit = settings.RECOMMENDATIONS_LIMIT
+    cache = _get_cache()
+    key = _user_key(cache, user_id)
+    state = cache.get(key)
+    if state is None:
+        state = _build_state(user_id)
+        cache.set(key, state, settings.RECOMMENDATIONS_TIMEOUT)
+    ranked = sorted(
+        state['scores'].items(),
+        key=lambda item: (-item[1][0] / item[1][1], -item[1][1], item[0])
+    )
+    return [title_id for title_id, _ in ranked[:limit]]
+
+
+def add_review(user_id, title_id, score):
+    """
+    Учитывает новый отзыв в сохраненном состоянии пользователя:
+    произведение убирается из кандидатов, его соседи добавляются
+    одним запросом. Если состояния в кэше нет, ничего не делает -
+    оно будет рассчитано при следующем запросе рекомендаций.
+    """
+    cache = _get_cache()
+    key = _user_key(cache, user_id)
+    state = cache.get(key)
+    if state is None:
+        return
+    if title_id in state['rated']:
+        cache.delete(key)
+        return
+    state['rated'][title_id] = score
+    state['scores'].pop(title_id, None)
+    _add_neighbours(state, SimilarTitle.objects.filter(
+        title_id=title_id
+    ).values_list('title_id', 'similar_id', 'score'))
+    cache.set(key, state, settings.RECOMMENDATIONS_TIMEOUT)
+
+
+def invalidate_user(user_id):
+    cache = _get_cache()
+    cache.delete(_user_key(cache, user_id))
+
+
+def invalidate_all():
+    """
+    Сбрасывает рекомендации всех пользователей
+    (после пересчета похожих произведений).
+    """
+    _get_cache().delete(VERSION_KEY)
@@ -0,0 +1,214 @@
+"""
+Отложенная запись отзывов (write-behind) для пиковой нагрузки.
+
+Если settings.REVIEW_WRITE_BEHIND включен, POST отзыва после проверки
+сохраняет его в локальную очередь (файл SQLite settings.REVIEW_QUEUE_PATH)
+и сразу отвечает 202. Команда flush_review_queue переносит отзывы
+из очереди в базу пакетами: один bulk INSERT на пакет, рейтинг и кэш
+карточек пересчитываются один раз для каждого произведения пакета.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+
+from change.models import Change, ChangeActions
+from review.models import Review
+from title.models import Title
+from user.models import User
+from .cache import bump_title_versions
+from .ratings import schedule_rating_update
+from .recommendations import invalidate_user
+
+
+class ReviewQueue:
+    """
+    Очередь отзывов в файле SQLite (WAL, synchronous=FULL):
+    запись переживает перезапуск воркера и доступна всем процессам
+    на машине. Соединение открывается отдельно в каждом процессе и потоке:
+    соединение sqlite3 нельзя использовать из другого потока.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=FULL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS review_queue ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'payload TEXT NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS review_queue_author_title '
+                "ON review_queue (json_extract(payload, '$.author_id'), "
+                "json_extract(payload, '$.title_id'))"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def put(self, payload):
+        """
+        Добавляет отзыв в очередь, если в ней нет отзыва того же автора
+        к тому же произведению. Проверка и запись выполняются в одной
+        транзакции BEGIN IMMEDIATE, поэтому два одновременных запроса
+        не добавят повторный отзыв. Возвращает True, если отзыв добавлен.
+        """
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            exists = connection.execute(
+                'SELECT 1 FROM review_queue '
+                "WHERE json_extract(payload, '$.author_id') = ? "
+                "AND json_extract(payload, '$.title_id') = ? LIMIT 1",
+                (payload['author_id'], payload['title_id'])
+            ).fetchone()
+            if not exists:
+                connection.execute(
+                    'INSERT INTO review_queue (payload) VALUES (?)',
+                    (json.dumps(payload, cls=DjangoJSONEncoder),)
+                )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return not exists
+
+    def peek(self, limit):
+        """
+        Первые limit записей очереди: [(id, payload), ...].
+        Записи остаются в очереди до ack().
+        """
+        rows = self._connect().execute(
+            'SELECT id, payload FROM review_queue ORDER BY id LIMIT ?',
+            (limit,)
+        ).fetchall()
+        return [(pk, json.loads(payload)) for pk, payload in rows]
+
+    def ack(self, ids):
+        ids = list(ids)
+        if ids:
+            self._connect().execute(
+                'DELETE FROM review_queue WHERE id IN ({})'.format(
+                    ', '.join('?' * len(ids))
+                ), ids
+            )
+
+    def __len__(self):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM review_queue'
+        ).fetchone()[0]
+
+
+_queues = {}
+
+
+def get_review_queue():
+    path = settings.REVIEW_QUEUE_PATH
+    if path not in _queues:
+        _queues[path] = ReviewQueue(path)
+    return _queues[path]
+
+
+def enqueue_review(author_id, title_id, text, score):
+    """
+    Ставит отзыв в очередь. Возвращает False, если отзыв этого автора
+    к этому произведению уже ждет переноса в базу.
+    """
+    return get_review_queue().put({
+        'author_id': author_id,
+        'title_id': title_id,
+        'text': text,
+        'score': score,
+    })
+
+
+def _create_reviews(reviews):
+    """
+    Создает отзывы одним bulk INSERT. Если отзыв того же автора
+    к тому же произведению успели создать синхронно (IntegrityError),
+    отзывы создаются по одному, а повторные пропускаются.
+    Возвращает созданные отзывы.
+    """
+    try:
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews)
+        return reviews
+    except IntegrityError:
+        pass
+    created = []
+    for review in reviews:
+        try:
+            with transaction.atomic():
+                Review.objects.bulk_create([review])
+        except IntegrityError:
+            continue
+        created.append(review)
+    return created
+
+
+def flush_reviews(batch_size=None):
+    """
+    Переносит в базу один пакет отзывов из очереди.
+    Отзывы к удаленным произведениям, от удаленных пользователей
+    и повторные отзывы (автор уже оценил произведение) пропускаются,
+    поэтому повторная обработка пакета после сбоя до ack безопасна.
+    Возвращает (обработано записей очереди, создано отзывов).
+    """
+    if batch_size is None:
+        batch_size = settings.REVIEW_QUEUE_BATCH_SIZE
+    queue = get_review_queue()
+    items = queue.peek(batch_size)
+    if not items:
+        return 0, 0
+    payloads = [payload for _, payload in items]
+    title_ids = {payload['title_id'] for payload in payloads}
+    author_ids = {payload['author_id'] for payload in payloads}
+
+    with transaction.atomic():
+        titles = set(Title.objects.filter(
+            id__in=title_ids
+        ).values_list('id', flat=True))
+        authors = set(User.objects.filter(
+            id__in=author_ids
+        ).values_list('id', flat=True))
+        seen = set(Review.objects.filter(
+            title_id__in=titles, author_id__in=authors
+        ).values_list('author_id', 'title_id'))
+        reviews = []
+        for payload in payloads:
+            key = (payload['author_id'], payload['title_id'])
+            if key in seen or key[0] not in authors or key[1] not in titles:
+                continue
+            seen.add(key)
+            reviews.append(Review(**payload))
+        reviews = _create_reviews(reviews)
+        created = {(review.author_id, review.title_id) for review in reviews}
+        review_ids = [
+            pk for pk, author_id, title_id in Review.objects.filter(
+                title_id__in={title_id for _, title_id in created},
+                author_id__in={author_id for author_id, _ in created},
+            ).values_list('id', 'author_id', 'title_id')
+            if (author_id, title_id) in created
+        ]
+        Change.record_many(Review, review_ids, ChangeActions.CREATE)
+
+    changed_titles = {title_id for _, title_id in created}
+    schedule_rating_update(changed_titles)
+    bump_title_versions(changed_titles)
+    for author_id in {author_id for author_id, _ in created}:
+        invalidate_user(author_id)
+    queue.ack(pk for pk, _ in items)
+    return len(items), len(reviews)
@@ -1,23 +1,50 @@
+import copy
+
+from django.conf import settings
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
+from rest_framework.relations import MANY_RELATION_KWARGS
 
+from change.models import Change
 from comment.models import Comment
 from review.models import Review
+from title.lookups import categories, genres
 from title.models import Category, Genre, Title
 from user.models import User
+from user.permissions import can_edit
+from .validators import UniqueIfChangedValidator
+
+_fields_cache = {}
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Кэширует набор полей ModelSerializer на уровне класса.
+    ModelSerializer.get_fields() разбирает модель при создании каждого
+    экземпляра; с миксином разбор выполняется один раз, а экземпляр
+    получает копию готовых полей.
+    """
+
+    def get_fields(self):
+        fields = _fields_cache.get(type(self))
+        if fields is None:
+            fields = super().get_fields()
+            _fields_cache[type(self)] = fields
+        return copy.deepcopy(fields)
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Класс UserSerializer. Сериализатор для модели User.
     Сериализует поля: 'first_name', 'last_name', ''username',
     'bio', 'email', 'role'.
+    Уникальность email и username проверяется запросом к базе
+    только если значение изменилось.
     """
     email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())]
+        validators=[UniqueIfChangedValidator(queryset=User.objects.all())]
     )
     username = serializers.CharField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
+        validators=[UniqueIfChangedValidator(queryset=User.objects.all())],
         default=email
     )
 
@@ -33,6 +60,29 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
 
+class UserListSerializer(serializers.Serializer):
+    """
+    Класс UserListSerializer. Облегченный сериализатор только для чтения,
+    используется для списка пользователей. Работает со словарями
+    из queryset.values(), без создания объектов модели и без валидаторов.
+    """
+    value_fields = (
+        'first_name',
+        'last_name',
+        'username',
+        'bio',
+        'email',
+        'role'
+    )
+
+    first_name = serializers.CharField(read_only=True)
+    last_name = serializers.CharField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    bio = serializers.CharField(read_only=True)
+    email = serializers.EmailField(read_only=True)
+    role = serializers.CharField(read_only=True)
+
+
 class YamdbRoleSerializer(UserSerializer):
     """
     Класс YamdbRoleSerializer. Сериализатор, наследованный
@@ -60,10 +110,27 @@ class CodeEmailSerializer(serializers.Serializer):
     code = serializers.CharField()
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class CanEditMixin(serializers.Serializer):
+    """
+    Добавляет поле can_edit - может ли текущий пользователь изменять объект.
+    Берет значение из аннотации queryset (annotate_can_edit), если она есть.
+    """
+    can_edit = serializers.SerializerMethodField()
+
+    def get_can_edit(self, obj):
+        value = getattr(obj, 'can_edit', None)
+        if value is None:
+            request = self.context.get('request')
+            value = request is not None and can_edit(request, obj)
+        return value
+
+
+class ReviewSerializer(CanEditMixin, CachedFieldsMixin,
+                       serializers.ModelSerializer):
     """
     Класс ReviewSerializer. Сериализатор для модели Review.
-    Сериализует поля: 'id', 'text', 'author', 'title', 'score', 'pub_date'.
+    Сериализует поля: 'id', 'text', 'author', 'title', 'score', 'pub_date',
+    'helpful_count', 'can_edit'.
     Есть проверка на случай повторного создания одного и того же Отзыва.
     (Описана в методе класса validate)
     """
@@ -77,7 +144,10 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = ('id', 'text', 'author', 'title', 'score', 'pub_date',)
+        fields = (
+            'id', 'text', 'author', 'title', 'score', 'pub_date',
+            'helpful_count', 'can_edit',
+        )
         model = Review
 
     def validate(self, attrs):
@@ -95,11 +165,16 @@ class ReviewSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(CanEditMixin, CachedFieldsMixin,
+                        serializers.ModelSerializer):
     """
     Класс CommentSerializer. Сериализатор для модели Comment.
-    Сериализует все поля модели.
-    Есть проверка на случай пустых данных.
+    Сериализует все поля модели, кроме path, и поля:
+    depth - глубина в ветке (0 - комментарий к отзыву),
+    reply_count - количество ответов в ветке комментария.
+    Есть проверка на случай пустых данных и на ответ: parent должен
+    относиться к тому же отзыву, глубина ограничена
+    settings.COMMENT_MAX_DEPTH, при изменении parent не меняется.
     (Описана в методе класса validate)
     """
     author = serializers.SlugRelatedField(
@@ -115,19 +190,52 @@ class CommentSerializer(serializers.ModelSerializer):
         slug_field='id',
         read_only=True
     )
+    depth = serializers.IntegerField(read_only=True)
+    reply_count = serializers.SerializerMethodField()
 
     class Meta:
-        fields = '__all__'
+        exclude = ('path',)
         model = Comment
 
+    def get_reply_count(self, obj):
+        return getattr(obj, 'reply_count', 0)
+
     def validate(self, attrs):
         if self.context['request'].META['REQUEST_METHOD'] == 'POST':
             if len(attrs) == 0:
                 raise serializers.ValidationError
+        parent = attrs.get('parent')
+        if self.instance is not None:
+            if 'parent' in attrs and parent != self.instance.parent:
+                raise serializers.ValidationError(
+                    {'parent': 'Нельзя перенести комментарий в другую ветку.'}
+                )
+        elif parent is not None:
+            review_id = self.context['view'].kwargs.get('review_id')
+            if str(parent.review_id) != str(review_id):
+                raise serializers.ValidationError(
+                    {'parent': 'Комментарий относится к другому отзыву.'}
+                )
+            if parent.depth + 1 > settings.COMMENT_MAX_DEPTH:
+                raise serializers.ValidationError(
+                    {'parent': 'Превышена глубина ветки.'}
+                )
         return attrs
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class ChangeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """
+    Сериализатор модели Change(Изменение) для журнала `/changes/`.
+    Поле seq - монотонный номер изменения.
+    """
+    seq = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        fields = ('seq', 'model', 'object_id', 'action', 'created')
+        model = Change
+
+
+class CategorySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор модели Category(Категория).
     Поля:
@@ -140,7 +248,7 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор модели Genre(Жанр).
     Поля:
@@ -153,25 +261,73 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class CategoryRelatedField(serializers.SlugRelatedField):
+class LookupRelatedField(serializers.SlugRelatedField):
     """
-    Поле отношений для category в TitileSerializer. Возвращает ключ - значение.
+    Поле отношений через slug для жанров и категорий.
+    Проверка slug и отображение объекта выполняются по таблице
+    в памяти процесса (title.lookups), без запросов к базе.
+    Возвращает ключ - значение.
     """
+    lookup_table = None
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.lookup_table.get_by_slug(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return obj
+
+    def get_attribute(self, instance):
+        pk = getattr(instance, f'{self.source_attrs[-1]}_id')
+        return None if pk is None else self.lookup_table.get_by_id(pk)
 
     def to_representation(self, obj):
-        return CategorySerializer(obj).data
+        return {'name': obj.name, 'slug': obj.slug}
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return LookupManyRelatedField(**list_kwargs)
 
 
-class GenreRelatedField(serializers.SlugRelatedField):
+class LookupManyRelatedField(serializers.ManyRelatedField):
     """
-    Поле отношений для genre в TitileSerializer. Возвращает ключ - значение.
+    Множественное поле для LookupRelatedField. Если у объекта есть
+    атрибут <поле>_ids (список id, см. api.cache), объекты берутся
+    из таблицы в памяти, иначе - запросом к базе.
     """
 
-    def to_representation(self, obj):
-        return GenreSerializer(obj).data
+    def get_attribute(self, instance):
+        ids = getattr(instance, f'{self.source_attrs[-1]}_ids', None)
+        if ids is None:
+            return super().get_attribute(instance)
+        lookup_table = self.child_relation.lookup_table
+        objects = [lookup_table.get_by_id(pk) for pk in ids]
+        return sorted(
+            (obj for obj in objects if obj is not None),
+            key=lambda obj: obj.slug
+        )
+
+
+class CategoryRelatedField(LookupRelatedField):
+    """
+    Поле отношений для category в TitileSerializer.
+    """
+    lookup_table = categories
+
+
+class GenreRelatedField(LookupRelatedField):
+    """
+    Поле отношений для genre в TitileSerializer.
+    """
+    lookup_table = genres
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор модели Title(Произведния).
     Поля:
@@ -180,7 +336,7 @@ class TitleSerializer(serializers.ModelSerializer):
     description - соотвестует модели, чтение и запись.
     category - поле отношений через slug, чтение и запись.
     genre - поле отношений через slug, чтение и запись, множественное.
-    rating - дополнительное поле тип int, не относится к модели, только чтение.
+    rating - средняя оценка, хранится в модели, тип int, только чтение.
     """
     genre = GenreRelatedField(
         slug_field='slug',
@@ -194,5 +350,5 @@ class TitleSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = ('name_lower',)
         model = Title
@@ -0,0 +1,70 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+
+from review.models import Review
+from title.models import Category, Genre, Title
+from .cache import bump_title_versions
+from .ratings import schedule_rating_update
+from .recommendations import add_review, invalidate_user
+
+
+def bump_title(sender, instance, **kwargs):
+    bump_title_versions([instance.pk])
+
+
+def bump_review_title(sender, instance, **kwargs):
+    if instance.title_id is not None:
+        schedule_rating_update([instance.title_id])
+        bump_title_versions([instance.title_id])
+
+
+def update_recommendations(sender, instance, created, **kwargs):
+    if instance.author_id is None:
+        return
+    if created and instance.title_id is not None:
+        add_review(instance.author_id, instance.title_id, instance.score)
+    else:
+        invalidate_user(instance.author_id)
+
+
+def invalidate_recommendations(sender, instance, **kwargs):
+    if instance.author_id is not None:
+        invalidate_user(instance.author_id)
+
+
+def bump_category_titles(sender, instance, **kwargs):
+    bump_title_versions(
+        Title.objects.filter(category=instance).values_list('id', flat=True)
+    )
+
+
+def bump_genre_titles(sender, instance, **kwargs):
+    bump_title_versions(
+        Title.genre.through.objects.filter(
+            genre=instance
+        ).values_list('title_id', flat=True)
+    )
+
+
+def bump_title_genre(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        bump_title_versions([instance.pk])
+    elif action == 'pre_clear':
+        bump_genre_titles(sender, instance)
+    elif pk_set:
+        bump_title_versions(pk_set)
+
+
+post_save.connect(bump_title, sender=Title)
+post_delete.connect(bump_title, sender=Title)
+post_save.connect(bump_review_title, sender=Review)
+post_delete.connect(bump_review_title, sender=Review)
+post_save.connect(update_recommendations, sender=Review)
+post_delete.connect(invalidate_recommendations, sender=Review)
+post_save.connect(bump_category_titles, sender=Category)
+pre_delete.connect(bump_category_titles, sender=Category)
+post_save.connect(bump_genre_titles, sender=Genre)
+pre_delete.connect(bump_genre_titles, sender=Genre)
+m2m_changed.connect(bump_title_genre, sender=Title.genre.through)
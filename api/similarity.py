@@ -0,0 +1,106 @@
+import heapq
+import math
+from collections import defaultdict
+from itertools import groupby, islice
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+
+from review.models import Review
+from title.models import SimilarTitle
+from .recommendations import invalidate_all
+
+SIMILAR_BATCH_SIZE = 1000
+
+
+def _centered_vectors(rows, max_reviews):
+    """
+    Оценки каждого пользователя за вычетом его средней оценки.
+    rows - (author_id, title_id, score), упорядоченные по author_id
+    и от новых отзывов к старым; от пользователя берутся только
+    первые max_reviews оценок.
+    """
+    for _, group in groupby(rows, key=itemgetter(0)):
+        scores = [
+            (title_id, score)
+            for _, title_id, score in islice(group, max_reviews)
+        ]
+        mean = sum(score for _, score in scores) / len(scores)
+        yield sorted(
+            (title_id, score - mean) for title_id, score in scores
+        )
+
+
+def compute_similar_titles(rows, top_k, min_common, max_reviews):
+    """
+    Сходство произведений по оценкам (item-item, косинусная мера
+    по центрированным оценкам пользователей). Матрица оценок разреженная:
+    скалярные произведения накапливаются только для пар произведений,
+    оцененных одним пользователем. Число пар квадратично по числу оценок
+    пользователя, поэтому учитываются только его max_reviews последних
+    отзывов: один активный автор не определяет время и память расчета.
+    Пары, оцененные меньше чем
+    min_common пользователями, и пары с неположительным сходством
+    пропускаются.
+    Возвращает {title_id: [(сходство, similar_id), ...]} - не больше
+    top_k соседей по убыванию сходства.
+    """
+    norms = defaultdict(float)
+    dots = defaultdict(float)
+    common = defaultdict(int)
+    for vector in _centered_vectors(rows, max_reviews):
+        for index, (title_id, value) in enumerate(vector):
+            norms[title_id] += value * value
+            for other_id, other_value in vector[index + 1:]:
+                pair = (title_id, other_id)
+                dots[pair] += value * other_value
+                common[pair] += 1
+
+    neighbours = defaultdict(list)
+    for (title_id, other_id), dot in dots.items():
+        if common[title_id, other_id] < min_common or dot <= 0:
+            continue
+        score = dot / math.sqrt(norms[title_id] * norms[other_id])
+        neighbours[title_id].append((score, other_id))
+        neighbours[other_id].append((score, title_id))
+    return {
+        title_id: heapq.nlargest(top_k, candidates)
+        for title_id, candidates in neighbours.items()
+    }
+
+
+def build_similar_titles(top_k=None, min_common=None, max_reviews=None):
+    """
+    Пересчитывает таблицу похожих произведений по всем отзывам
+    (от каждого автора - не больше max_reviews последних,
+    settings.SIMILAR_TITLES_MAX_USER_REVIEWS).
+    Отзывы читаются одним проходом, упорядоченными по автору;
+    таблица заменяется целиком в одной транзакции,
+    рекомендации пользователей сбрасываются.
+    Возвращает количество сохраненных пар.
+    """
+    if top_k is None:
+        top_k = settings.SIMILAR_TITLES_TOP_K
+    if min_common is None:
+        min_common = settings.SIMILAR_TITLES_MIN_COMMON
+    if max_reviews is None:
+        max_reviews = settings.SIMILAR_TITLES_MAX_USER_REVIEWS
+    rows = Review.objects.filter(
+        author__isnull=False, title__isnull=False
+    ).order_by('author_id', '-pub_date', '-id').values_list(
+        'author_id', 'title_id', 'score'
+    ).iterator(chunk_size=2000)
+    neighbours = compute_similar_titles(
+        rows, top_k, min_common, max_reviews
+    )
+    with transaction.atomic():
+        SimilarTitle.objects.all().delete()
+        count = len(SimilarTitle.objects.bulk_create((
+            SimilarTitle(title_id=title_id, similar_id=similar_id,
+                         score=score)
+            for title_id, candidates in neighbours.items()
+            for score, similar_id in candidates
+        ), batch_size=SIMILAR_BATCH_SIZE))
+    invalidate_all()
+    return count
@@ -0,0 +1,165 @@
+import time
+import uuid
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+LOCAL_BUCKETS_LIMIT = 10000
+
+RATE_DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Разбирает лимит вида '5/min' в пару (запросов, секунд).
+    Для пустого лимита возвращает (None, None).
+    """
+    if rate is None:
+        return None, None
+    num, period = rate.split('/')
+    return int(num), RATE_DURATIONS[period[0]]
+
+
+class LocalTokenBuckets:
+    """
+    Хранилище token bucket в памяти процесса.
+    Состояние ведра - кортеж (токены, время), который вместе со сроком
+    хранения заменяется целиком одним присваиванием, поэтому блокировки
+    не нужны: при гонке потоков ведро может пропустить лишний запрос,
+    но не сломаться. Срок хранения - период лимита: за это время ведро
+    наполняется полностью, и его можно забыть.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+
+    def get(self, key):
+        item = self._buckets.get(key)
+        return item[0] if item is not None else None
+
+    def set(self, key, state, ttl):
+        if len(self._buckets) >= LOCAL_BUCKETS_LIMIT:
+            self._prune(state[1])
+        self._buckets[key] = (state, state[1] + ttl)
+
+    def clear(self):
+        self._buckets.clear()
+
+    def _prune(self, now):
+        self._buckets = {
+            key: item for key, item in self._buckets.items()
+            if item[1] > now
+        }
+
+
+class CacheTokenBuckets:
+    """
+    Хранилище token bucket в общем кэше Django, общее для всех воркеров.
+    Ключи ведер содержат поколение из GENERATION_KEY: clear() меняет
+    поколение, и прежние ведра истекают сами, не затрагивая остальные
+    ключи кэша.
+    """
+    GENERATION_KEY = 'throttle:generation'
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def _generation(self):
+        generation = self.cache.get(self.GENERATION_KEY)
+        if generation is None:
+            self.cache.add(self.GENERATION_KEY, uuid.uuid4().hex, None)
+            generation = self.cache.get(self.GENERATION_KEY)
+        return generation
+
+    def _key(self, key):
+        return f'{key}:{self._generation()}'
+
+    def get(self, key):
+        return self.cache.get(self._key(key))
+
+    def set(self, key, state, ttl):
+        self.cache.set(self._key(key), state, ttl)
+
+    def clear(self):
+        self.cache.set(self.GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+local_buckets = LocalTokenBuckets()
+
+
+def get_buckets():
+    alias = getattr(settings, 'YAMDB_THROTTLE_CACHE', None)
+    if alias:
+        return CacheTokenBuckets(alias)
+    return local_buckets
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый throttle на основе token bucket.
+    Ёмкость ведра и скорость пополнения берутся из
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'][scope] в формате '5/min'.
+    Хранилище - память процесса или кэш из settings.YAMDB_THROTTLE_CACHE.
+    """
+    scope = None
+    timer = time.time
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.capacity, self.duration = parse_rate(rate)
+        self.wait_time = None
+
+    def get_ident_key(self, request, view):
+        """
+        Ключ, по которому считаются запросы; None - не ограничивать.
+        По умолчанию - IP-адрес клиента.
+        """
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        if self.capacity is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+        key = f'throttle:{self.scope}:{view.__class__.__name__}:{ident}'
+        buckets = get_buckets()
+        now = self.timer()
+        refill_rate = self.capacity / self.duration
+        tokens, updated = buckets.get(key) or (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - updated) * refill_rate)
+        if tokens < 1:
+            self.wait_time = (1 - tokens) / refill_rate
+            return False
+        buckets.set(key, (tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """
+    Ограничение запросов к `/auth/` с одного IP-адреса.
+    """
+    scope = 'auth_ip'
+
+
+class AuthEmailThrottle(TokenBucketThrottle):
+    """
+    Ограничение запросов к `/auth/` для одного email.
+    Запросы без email (в том числе с телом не в виде объекта)
+    ограничиваются только по IP (AuthIPThrottle).
+    """
+    scope = 'auth_email'
+
+    def get_ident_key(self, request, view):
+        if not isinstance(request.data, Mapping):
+            return None
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None
+        return email.strip().lower()
@@ -1,9 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, EmailRegisterView,
-                    GenreViewSet, ReviewViewSet, TitleViewSet, TokenView,
-                    UserViewSet)
+from .views import (CategoryViewSet, ChangeListView, CommentViewSet,
+                    EmailRegisterView, ExportView, GenreViewSet,
+                    ReviewViewSet, TitleViewSet, TokenView, UserViewSet)
 
 router_v1 = DefaultRouter()
 router_v1.register('users', UserViewSet, 'users')
@@ -51,5 +51,15 @@ urlpatterns = [
         'v1/auth/token/',
         TokenView.as_view(),
         name='get_token'
+    ),
+    path(
+        'v1/changes/',
+        ChangeListView.as_view(),
+        name='changes'
+    ),
+    path(
+        'v1/export/<slug:dataset>.<slug:export_format>',
+        ExportView.as_view(),
+        name='export'
     )
 ]
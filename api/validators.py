@@ -0,0 +1,16 @@
+from rest_framework.validators import UniqueValidator
+
+
+class UniqueIfChangedValidator(UniqueValidator):
+    """
+    UniqueValidator, который не обращается к базе, если при изменении
+    объекта значение поля не отличается от текущего.
+    """
+
+    def __call__(self, value, serializer_field):
+        instance = getattr(serializer_field.parent, 'instance', None)
+        field_name = serializer_field.source_attrs[-1]
+        if (instance is not None
+                and getattr(instance, field_name, None) == value):
+            return
+        super().__call__(value, serializer_field)
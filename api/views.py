@@ -1,25 +1,46 @@
-from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Min
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from api_yamdb.queries import prefix_q
+from change.models import Change
 from comment.models import Comment
+from comment.threads import annotate_reply_count
 from review.models import Review
+from review.votes import add_vote, get_helpful_count, remove_vote
 from title.filters import TitleFilter
-from title.models import Category, Genre, Title
+from title.models import Category, Genre, SimilarTitle, Title
+from user.filters import UserSearchFilter
 from user.models import User
 from user.permissions import (IsAdmin, IsAdminOrReadOnly,
-                              IsAuthorOrAdminOrModerator)
-from .serializers import (CategorySerializer, CodeEmailSerializer,
-                          CommentSerializer, GenreSerializer, ReviewSerializer,
-                          TitleSerializer, UserEmailSerializer, UserSerializer,
-                          YamdbRoleSerializer)
+                              IsAuthorOrAdminOrModerator, annotate_can_edit)
+from .cache import get_title_cards
+from .confirmation import check_code, consume_code, issue_code
+from .deletion import delete_review, delete_title, delete_user
+from .export import EXPORT_DATASETS, EXPORT_FORMATS, iter_export
+from .facets import get_facets
+from .pagination import HistoryCursorPagination, KeysetPagination
+from .recommendations import get_recommendations
+from .review_queue import enqueue_review
+from .serializers import (CategorySerializer, ChangeSerializer,
+                          CodeEmailSerializer, CommentSerializer,
+                          GenreSerializer, ReviewSerializer, TitleSerializer,
+                          UserEmailSerializer, UserListSerializer,
+                          UserSerializer, YamdbRoleSerializer)
+from .throttling import AuthEmailThrottle, AuthIPThrottle
 from .utils import send_confirmation_code
 
 
@@ -44,13 +65,37 @@ class UserViewSet(viewsets.ModelViewSet):
         (Вернет 200 и объект учетной записи, или ошибку 400)
     * Изменить данные своей учетной записи. (PATCH)
         (Вернет 200 при успешном запросе, или ошибку 400)
+
+    * Получить рекомендованные произведения. (GET me/recommendations)
+        (Вернет 200 и список произведений по убыванию ожидаемой оценки)
+
+    Любой пользователь может:
+
+    * Получить отзывы или комментарии пользователя по его `username`.
+        (GET {username}/reviews/, {username}/comments/)
+        (Вернет 200 и страницу от новых к старым с курсором `next`,
+        или ошибку 404)
+
+    Список пользователей отдается постранично по ключу id (параметр `after`;
+    номер страницы `page` тоже поддерживается), поиск `search` - по началу
+    username или email без учета регистра.
     """
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = 'username'
     permission_classes = (IsAuthenticated, IsAdmin,)
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('username',)
+    filter_backends = (UserSearchFilter,)
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        if self.action == 'list':
+            return User.objects.values('id', *UserListSerializer.value_fields)
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return UserListSerializer
+        return super().get_serializer_class()
 
     @action(
         methods=['get', 'patch'],
@@ -59,7 +104,7 @@ class UserViewSet(viewsets.ModelViewSet):
         url_path='me'
     )
     def user_profile(self, request):
-        user = get_object_or_404(User, id=request.user.id)
+        user = request.user
         if request.method == 'GET':
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -69,27 +114,78 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        methods=['get'],
+        detail=False,
+        permission_classes=(IsAuthenticated,),
+        url_path='me/recommendations'
+    )
+    def recommendations(self, request):
+        cards = get_title_cards(get_recommendations(request.user.id))
+        return Response(cards, status=status.HTTP_200_OK)
+
+    def _history(self, queryset, serializer_class):
+        author_id = User.objects.filter(
+            username=self.kwargs['username']
+        ).values_list('id', flat=True).first()
+        if author_id is None:
+            raise Http404
+        queryset = annotate_can_edit(
+            queryset.filter(author_id=author_id), self.request
+        )
+        paginator = HistoryCursorPagination()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        methods=['get'],
+        detail=True,
+        permission_classes=(IsAuthenticatedOrReadOnly,)
+    )
+    def reviews(self, request, username=None):
+        return self._history(
+            Review.objects.select_related('author', 'title'),
+            ReviewSerializer
+        )
+
+    @action(
+        methods=['get'],
+        detail=True,
+        permission_classes=(IsAuthenticatedOrReadOnly,)
+    )
+    def comments(self, request, username=None):
+        return self._history(
+            annotate_reply_count(Comment.objects.select_related(
+                'author', 'title', 'review'
+            )),
+            CommentSerializer
+        )
+
+    def perform_destroy(self, instance):
+        delete_user(instance)
+
 
 class EmailRegisterView(APIView):
     """
     Класс APIView для получения confirmation_code по
-        email пользователя
+        email пользователя. Код хранится в кэше, к базе запрос не обращается,
+        пользователь создается при получении токена.
 
     Возвращает:
     * статус 200, отправляет код подтверждение на email пользователя
     * статус 400, если email не указан
+    * статус 429, если превышен лимит запросов с IP или для email
     """
+    throttle_classes = (AuthIPThrottle, AuthEmailThrottle)
 
     def post(self, request):
         serializer = UserEmailSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data.get('email')
-        user, create = User.objects.get_or_create(email=email)
-        if create:
-            user.username = email
-            user.save()
-        conf_code = default_token_generator.make_token(user)
-        send_confirmation_code(email, conf_code)
+        send_confirmation_code(email, issue_code(email))
         return Response(
             f'Confirmation code will be sent to your {email}',
             status=status.HTTP_200_OK
@@ -99,27 +195,115 @@ class EmailRegisterView(APIView):
 class TokenView(APIView):
     """
     Класс APIView для получения access токена для
-        доступа к ресурсам API
+        доступа к ресурсам API. Код проверяется по кэшу, затем
+        пользователь ищется по email без учета регистра (или создается
+        при первом входе), и только после этого код расходуется:
+        если пользователя получить не удалось, код действует дальше.
 
     Возвращает:
     * статус 200 и сгенерированный token
     * статус 400, если не указан email или
-        указан неверный confirmation_code
+        указан неверный confirmation_code, или email
+        принадлежит нескольким пользователям
+    * статус 429, если превышен лимит запросов с IP или для email
     """
+    throttle_classes = (AuthIPThrottle, AuthEmailThrottle)
 
     def post(self, request):
         serializer = CodeEmailSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        email = serializer.validated_data.get('email')
+        email = serializer.validated_data.get('email').lower()
         code = serializer.validated_data.get('code')
-        user = get_object_or_404(User, email=email)
-        if default_token_generator.check_token(user, code):
-            token = RefreshToken.for_user(user).access_token
-            return Response(
-                {'token': str(token)},
-                status=status.HTTP_200_OK
+        if not check_code(email, code):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user, _ = User.objects.get_or_create(
+                email_lower=email,
+                defaults={'email': email, 'username': email}
             )
-        return Response(status=status.HTTP_400_BAD_REQUEST)
+        except (User.MultipleObjectsReturned, IntegrityError):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        if not consume_code(email, code):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        token = RefreshToken.for_user(user).access_token
+        return Response(
+            {'token': str(token)},
+            status=status.HTTP_200_OK
+        )
+
+
+class ExportView(APIView):
+    """
+    Класс APIView для потоковой выгрузки каталога.
+    Разрешения: IsAuthenticated, IsAdmin.
+    `/export/<набор>.<формат>`, где набор - category, genre, titles,
+    genre_title, review, comments, users; формат - ndjson или csv.
+    Данные читаются курсором пакетами и отдаются StreamingHttpResponse,
+    поэтому память не зависит от размера каталога.
+
+    Возвращает:
+    * статус 200 и поток строк выгрузки
+    * статус 404, если набор или формат неизвестны
+    """
+    permission_classes = (IsAuthenticated, IsAdmin,)
+
+    def get(self, request, dataset, export_format):
+        if (dataset not in EXPORT_DATASETS
+                or export_format not in EXPORT_FORMATS):
+            raise Http404
+        response = StreamingHttpResponse(
+            iter_export(dataset, export_format),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{export_format}"'
+        )
+        return response
+
+
+class ChangeListView(APIView):
+    """
+    Класс APIView журнала изменений для инкрементальной синхронизации.
+    Возвращает изменения Title, Category, Genre, Review, Comment
+    с номером больше `since` (по умолчанию 0), не больше `limit` за раз.
+    Клиент передает полученный `next_since` в следующий запрос.
+    Ответ заканчивается перед первым изменением моложе
+    settings.CHANGES_COMMIT_LAG секунд: запись с меньшим номером может
+    быть еще не зафиксирована, и после `since` она была бы пропущена.
+    Разрешения: IsAuthenticated, IsAdmin.
+
+    Возвращает:
+    * статус 200, {'results': [...], 'next_since': номер последнего изменения}
+    * статус 400, если since или limit не целые неотрицательные числа
+    """
+    permission_classes = (IsAuthenticated, IsAdmin,)
+    default_limit = 100
+    max_limit = 1000
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        if since < 0 or limit < 1:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        settled = timezone.now() - timedelta(
+            seconds=settings.CHANGES_COMMIT_LAG
+        )
+        changes = Change.objects.filter(id__gt=since)
+        unsettled = changes.filter(created__gt=settled).aggregate(
+            first=Min('id')
+        )['first']
+        if unsettled is not None:
+            changes = changes.filter(id__lt=unsettled)
+        changes = changes.order_by('id')[:min(limit, self.max_limit)]
+        serializer = ChangeSerializer(changes, many=True)
+        results = serializer.data
+        return Response({
+            'results': results,
+            'next_since': results[-1]['seq'] if results else since,
+        }, status=status.HTTP_200_OK)
 
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -139,6 +323,16 @@ class ReviewViewSet(viewsets.ModelViewSet):
         Нет токена (пользовтель не аунтифицирован (статус 401).
         Объект оценки не найден (статус 404).
         Неверные данные (статус 400))
+        Если включен settings.REVIEW_WRITE_BEHIND, отзыв после проверки
+        ставится в очередь (api.review_queue) и возвращается статус 202
+        без id и pub_date; повторный отзыв автора, уже ждущий в очереди,
+        возвращает статус 400.
+
+    Отметить отзыв полезным (POST helpful) или отменить голос
+    (DELETE helpful) может Аунтифицированный пользователь, кроме автора.
+        (Вернет статус 200 и точное количество голосов helpful_count.)
+    `?ordering=helpful` - отзывы по убыванию helpful_count (индекс
+    review_title_helpful_idx).
 
     Частично обновить отзыв по id могут :
                                     Автор, Модератор, Администратор. (PATCH)
@@ -161,11 +355,60 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return Review.objects.filter(title=title)
+        queryset = Review.objects.filter(title=title)
+        if self.request.query_params.get('ordering') == 'helpful':
+            queryset = queryset.order_by('-helpful_count', '-id')
+        return annotate_can_edit(queryset, self.request)
+
+    @action(
+        methods=['post', 'delete'],
+        detail=True,
+        permission_classes=(IsAuthenticated,)
+    )
+    def helpful(self, request, title_id=None, pk=None):
+        review = get_object_or_404(Review, id=pk, title_id=title_id)
+        if review.author_id == request.user.id:
+            return Response(
+                {'detail': 'Нельзя голосовать за свой отзыв.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if request.method == 'POST':
+            add_vote(review, request.user)
+        else:
+            remove_vote(review, request.user)
+        return Response({
+            'voted': request.method == 'POST',
+            'helpful_count': get_helpful_count(review.pk),
+        }, status=status.HTTP_200_OK)
+
+    def create(self, request, *args, **kwargs):
+        if not settings.REVIEW_WRITE_BEHIND:
+            return super().create(request, *args, **kwargs)
+        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if not enqueue_review(
+            request.user.id, title.id, data['text'], data['score']
+        ):
+            raise ValidationError('Уже существует')
+        return Response({
+            'text': data['text'],
+            'author': request.user.username,
+            'title': title.id,
+            'score': data['score'],
+        }, status=status.HTTP_202_ACCEPTED)
 
     def perform_create(self, serializer):
         title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            raise ValidationError('Уже существует')
+
+    def perform_destroy(self, instance):
+        delete_review(instance)
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -198,6 +441,12 @@ class CommentViewSet(viewsets.ModelViewSet):
         Нет токена (пользовтель не аунтифицирован (статус 401).
         Нет доступа (у пользователя нет прав (статус 403)).
         Объект оценки не найден (статус 404).)
+
+    Ответ на комментарий - POST с полем parent (id комментария).
+    Ветки читаются по пути comment.path одним диапазоном по индексу:
+    `?ordering=thread` - все комментарии отзыва в порядке веток,
+    `?subtree=<id>` - комментарий и все ответы на него.
+    reply_count - количество ответов в ветке каждого комментария.
     """
     serializer_class = CommentSerializer
     permission_classes = (
@@ -208,10 +457,21 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
         review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return Comment.objects.filter(
-            title=title,
-            review=review
-        )
+        queryset = Comment.objects.filter(title=title, review=review)
+        subtree = self.request.query_params.get('subtree')
+        if self.action == 'list' and subtree is not None:
+            root = Comment.objects.filter(
+                review=review, id=subtree if subtree.isdigit() else None
+            ).values_list('path', flat=True).first()
+            if root is None:
+                raise Http404
+            queryset = queryset.filter(prefix_q('path', root))
+        if self.action == 'list' and (
+            subtree is not None
+            or self.request.query_params.get('ordering') == 'thread'
+        ):
+            queryset = queryset.order_by('path')
+        return annotate_can_edit(annotate_reply_count(queryset), self.request)
 
     def perform_create(self, serializer):
         title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
@@ -258,11 +518,53 @@ class TitleViewSet(viewsets.ModelViewSet):
     ModelViewSet для Title(Произведение).
     Права доступа: администратор - чтение и запись, остальные - только чтение.
     Поиск: по genre__slug, category__slug, year, name.
-    Возвращает дополнительное значение rating - серднее значение всех объектов,
-    модели Review(Отзыв), отнесенных к объекту модели Title(Произведение).
+    Возвращает значение rating - серднее значение всех объектов,
+    модели Review(Отзыв), отнесенных к объекту модели Title(Произведение),
+    хранится в поле модели.
+    Список и отдельное произведение собираются из кэша карточек (api.cache),
+    из базы для страницы читаются только id.
+    facets - количество произведений по жанрам, категориям и десятилетиям
+    с учетом тех же фильтров, что и список (api.facets).
+    similar - похожие произведения по убыванию сходства, заранее
+    рассчитанные командой build_similar_titles (api.similarity).
     """
-    queryset = Title.objects.annotate(
-        rating=Avg('review_title__score')).all().order_by('pk')
+    queryset = Title.objects.all().order_by('pk')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filterset_class = TitleFilter
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(Title.objects.order_by('pk'))
+        page = self.paginate_queryset(queryset.values_list('id', flat=True))
+        return self.get_paginated_response(get_title_cards(page))
+
+    @action(detail=False, methods=('get',))
+    def facets(self, request):
+        queryset = self.filter_queryset(Title.objects.all())
+        return Response(get_facets(queryset), status=status.HTTP_200_OK)
+
+    def _get_title_id(self):
+        try:
+            return int(self.kwargs['pk'])
+        except ValueError:
+            raise Http404
+
+    def retrieve(self, request, *args, **kwargs):
+        cards = get_title_cards([self._get_title_id()])
+        if not cards:
+            raise Http404
+        return Response(cards[0], status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=('get',))
+    def similar(self, request, pk=None):
+        title_id = self._get_title_id()
+        similar_ids = SimilarTitle.objects.filter(
+            title_id=title_id
+        ).order_by('-score').values_list('similar_id', flat=True)
+        cards = get_title_cards([title_id, *similar_ids])
+        if not cards or cards[0]['id'] != title_id:
+            raise Http404
+        return Response(cards[1:], status=status.HTTP_200_OK)
+
+    def perform_destroy(self, instance):
+        delete_title(instance)
@@ -0,0 +1,163 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def _compressobj(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        compressor = self._compressobj()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks):
+        compressor = self._compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class BrotliEncoder:
+    name = 'br'
+
+    def __init__(self, level=5):
+        self.level = level
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class ZstdEncoder:
+    name = 'zstd'
+
+    def __init__(self, level=3):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def get_available_encoders():
+    """
+    Кодировщики в порядке предпочтения сервера из
+    settings.COMPRESSION_ENCODINGS; недоступные библиотеки пропускаются.
+    """
+    encoders = {'gzip': GzipEncoder}
+    if brotli is not None:
+        encoders['br'] = BrotliEncoder
+    if zstandard is not None:
+        encoders['zstd'] = ZstdEncoder
+    return [
+        encoders[name]() for name in settings.COMPRESSION_ENCODINGS
+        if name in encoders
+    ]
+
+
+def parse_accept_encoding(header):
+    """
+    Разбирает заголовок Accept-Encoding в словарь {кодировка: q}.
+    """
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы кодировкой, выбранной по Accept-Encoding:
+    br (если установлен brotli), zstd (если установлен zstandard), gzip.
+    Ответы короче settings.COMPRESSION_MIN_LENGTH байт не сжимаются.
+    Потоковые ответы (выгрузка каталога) сжимаются по мере отдачи.
+    Заменяет django.middleware.gzip.GZipMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encoders = get_available_encoders()
+        self.min_length = settings.COMPRESSION_MIN_LENGTH
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder = self.choose_encoder(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoder is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = encoder.stream(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = encoder.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoder.name
+        return response
+
+    def choose_encoder(self, header):
+        accepted = parse_accept_encoding(header)
+        default_quality = accepted.get('*', 0.0)
+        for encoder in self.encoders:
+            if accepted.get(encoder.name, default_quality) > 0:
+                return encoder
+        return None
@@ -0,0 +1,10 @@
+from django.db.models import Q
+
+
+def prefix_q(field, prefix):
+    """
+    Условие "поле начинается с prefix" в виде диапазона
+    prefix <= поле < prefix + '\\uffff'. В отличие от LIKE 'x%',
+    диапазон использует обычный индекс на любой СУБД.
+    """
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\uffff'})
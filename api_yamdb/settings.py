@@ -16,18 +16,19 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'rest_framework.authtoken',
     'rest_framework',
     'django_filters',
     'review',
     'comment',
     'user',
     'api',
-    'title'
+    'title',
+    'change',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -36,6 +37,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Сжатие ответов (api_yamdb.middleware.CompressionMiddleware).
+# Кодировки в порядке предпочтения; br и zstd используются,
+# если установлены пакеты brotli и zstandard.
+COMPRESSION_ENCODINGS = ('br', 'zstd', 'gzip')
+
+COMPRESSION_MIN_LENGTH = 512
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
@@ -57,6 +65,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Прогрев воркера при загрузке wsgi-приложения (api_yamdb.warmup).
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', '1') == '1'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -64,8 +75,100 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 AUTH_USER_MODEL = 'user.User'
 
+# Коды подтверждения `/auth/email/` хранятся в кэше и действуют
+# CONFIRMATION_CODE_TTL секунд. Для нескольких воркеров нужен общий кэш
+# (иначе предупреждение api.W001 при запуске).
+CONFIRMATION_CODE_CACHE = 'default'
+
+CONFIRMATION_CODE_TTL = 15 * 60
+
+# Кэш сериализованных карточек произведений (api.cache). Версии карточек
+# сбрасываются в этом кэше, поэтому для нескольких воркеров он должен быть
+# общим (иначе предупреждение api.W001 при запуске).
+TITLE_CARD_CACHE = 'default'
+
+TITLE_CARD_TIMEOUT = 24 * 60 * 60
+
+# Таблицы жанров и категорий в памяти процесса (title.lookups):
+# общая версия хранится в кэше и проверяется не чаще раза в интервал.
+# Кэш должен быть общим для воркеров (иначе предупреждение api.W001).
+LOOKUP_CACHE = 'default'
+
+LOOKUP_CHECK_INTERVAL = 1.0
+
+# Пересчет рейтинга произведений (api.ratings): 'sync' - сразу при
+# изменении отзыва, 'deferred' - командой update_ratings для отмеченных
+# произведений. Произведение пересчитывается, когда отзывы к нему
+# не менялись RATING_DEBOUNCE секунд, но не позже RATING_MAX_STALENESS
+# секунд после первого изменения.
+RATING_UPDATE_MODE = os.getenv('RATING_UPDATE_MODE', 'sync')
+
+RATING_DEBOUNCE = 1.0
+
+RATING_MAX_STALENESS = 10.0
+
+RATING_BATCH_SIZE = 1000
+
+# Журнал изменений (change.Change): номер изменения выдается при INSERT,
+# а видимым запись становится при COMMIT, поэтому транзакции могут
+# зафиксироваться не по порядку номеров. `/changes/` и индекс жанров
+# (api.facets) считают прочитанными только записи старше
+# CHANGES_COMMIT_LAG секунд: транзакции должны укладываться в это время.
+CHANGES_COMMIT_LAG = float(os.getenv('CHANGES_COMMIT_LAG', '5'))
+
+# Голоса "полезно" за отзывы (review.votes): при значении больше 1
+# счетчик популярного отзыва распределяется по частям, которые переносит
+# в отзыв команда fold_review_votes.
+REVIEW_VOTE_SHARDS = int(os.getenv('REVIEW_VOTE_SHARDS', '1'))
+
+REVIEW_VOTE_FOLD_BATCH_SIZE = 1000
+
+# Максимальная глубина ветки комментариев: путь comment.path
+# (255 символов, по 11 на уровень) вмещает 23 уровня.
+COMMENT_MAX_DEPTH = 20
+
+# Похожие произведения (api.similarity): сколько соседей хранится
+# для произведения, минимальное число пользователей, оценивших оба,
+# и сколько последних отзывов пользователя учитывается в расчете
+# (число пар произведений квадратично по числу отзывов).
+SIMILAR_TITLES_TOP_K = 10
+
+SIMILAR_TITLES_MIN_COMMON = 2
+
+SIMILAR_TITLES_MAX_USER_REVIEWS = 200
+
+# Рекомендации `/users/me/recommendations/` (api.recommendations):
+# состояние расчета для пользователя хранится в кэше. Новые отзывы
+# обновляют состояние только в этом кэше, поэтому для нескольких воркеров
+# он должен быть общим (иначе предупреждение api.W001 при запуске).
+RECOMMENDATIONS_CACHE = 'default'
+
+RECOMMENDATIONS_TIMEOUT = 24 * 60 * 60
+
+RECOMMENDATIONS_LIMIT = 10
+
+# Отложенная запись отзывов (api.review_queue): POST отзыва сохраняет его
+# в локальную очередь, в базу отзывы переносит команда flush_review_queue.
+REVIEW_WRITE_BEHIND = os.getenv('REVIEW_WRITE_BEHIND', '0') == '1'
+
+REVIEW_QUEUE_PATH = os.getenv(
+    'REVIEW_QUEUE_PATH', os.path.join(BASE_DIR, 'review_queue.sqlite3')
+)
+
+REVIEW_QUEUE_BATCH_SIZE = 500
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -93,8 +196,16 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.getenv('AUTH_IP_THROTTLE_RATE', '30/min'),
+        'auth_email': os.getenv('AUTH_EMAIL_THROTTLE_RATE', '5/min'),
+    },
 }
 
+# Алиас кэша для общих между воркерами token bucket ограничений `/auth/`.
+# Если не задан, ведра хранятся в памяти процесса.
+YAMDB_THROTTLE_CACHE = os.getenv('YAMDB_THROTTLE_CACHE')
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
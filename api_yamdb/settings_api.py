@@ -0,0 +1,37 @@
+"""
+Профиль настроек для воркеров только с API:
+
+    DJANGO_SETTINGS_MODULE=api_yamdb.settings_api
+
+API аутентифицирует запросы по JWT и не использует сессии, CSRF-токены,
+сообщения и админку, поэтому эти приложения и middleware отключены.
+Админка обслуживается воркерами с основным профилем api_yamdb.settings.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, TEMPLATES
+
+API_ONLY_EXCLUDED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+)
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS if app not in API_ONLY_EXCLUDED_APPS
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.CompressionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {
+        'context_processors': [
+            'django.template.context_processors.debug',
+            'django.template.context_processors.request',
+        ],
+    },
+}]
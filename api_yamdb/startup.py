@@ -0,0 +1,140 @@
+"""
+Замер запуска воркера в отдельном процессе, используется командой
+profile_startup:
+
+    python -m api_yamdb.startup [url] [пакет ...]
+
+Печатает в stdout JSON: собственное время импорта модулей каждого пакета
+и время django.setup(), загрузки URLconf, компиляции URL-шаблонов
+и первых запросов в миллисекундах.
+"""
+import json
+import os
+import sys
+import time
+
+
+class _TimingLoader:
+    """
+    Обертка загрузчика модуля, замеряющая выполнение модуля.
+    """
+
+    def __init__(self, loader, name, timer):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.start()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.stop(self._name)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportTimer:
+    """
+    Finder в sys.meta_path, замеряющий собственное время выполнения
+    каждого импортируемого модуля (без вложенных импортов).
+    В отличие от `python -X importtime` учитывает и модули,
+    импортированные через importlib.import_module, как это делает Django.
+    """
+
+    def __init__(self):
+        self.self_times = {}
+        self._stack = []
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimingLoader(spec.loader, name, self)
+            return spec
+        return None
+
+    def start(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def stop(self, name):
+        started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.self_times[name] = (elapsed - nested) * 1000
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def totals(self, packages):
+        """
+        Суммирует время модулей по пакетам. Модуль относится
+        к первому пакету из packages, которому он принадлежит.
+        """
+        totals = dict.fromkeys(packages, 0.0)
+        for name, elapsed in self.self_times.items():
+            for package in packages:
+                if name == package or name.startswith(package + '.'):
+                    totals[package] += elapsed
+                    break
+        return totals
+
+
+def _elapsed(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def _request(client, url):
+    start = time.perf_counter()
+    try:
+        status = client.get(url).status_code
+    except Exception as error:
+        status = type(error).__name__
+    return status, _elapsed(start)
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    url = sys.argv[1] if len(sys.argv) > 1 else '/api/v1/titles/'
+    packages = sys.argv[2:]
+    timer = ImportTimer()
+    sys.meta_path.insert(0, timer)
+    timings = {}
+
+    start = time.perf_counter()
+    import django
+    django.setup()
+    timings['django.setup()'] = _elapsed(start)
+
+    from django.urls import get_resolver
+    start = time.perf_counter()
+    resolver = get_resolver()
+    resolver.url_patterns
+    timings['urlconf import'] = _elapsed(start)
+
+    start = time.perf_counter()
+    resolver.reverse_dict
+    resolver.resolve(url)
+    timings['url resolver compile'] = _elapsed(start)
+
+    from django.test import Client
+    client = Client()
+    for request in ('first', 'second'):
+        status, elapsed = _request(client, url)
+        timings[f'{request} request {url} ({status})'] = elapsed
+
+    sys.meta_path.remove(timer)
+    json.dump({
+        'imports': timer.totals(packages),
+        'timings': timings,
+    }, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
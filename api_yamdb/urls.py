@@ -1,9 +1,8 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
 from django.views.generic import TemplateView
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path(
         'redoc/',
@@ -11,3 +10,10 @@ urlpatterns = [
         name='redoc'
     ),
 ]
+
+# Админка импортируется, только если приложение установлено:
+# воркеры только для API могут работать без неё.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -0,0 +1,88 @@
+"""
+Прогрев воркера при запуске, чтобы первые запросы не платили
+за импорт модулей, компиляцию URL-шаблонов, подключение к базе
+и заполнение кэшей.
+
+Вызывается из api_yamdb/wsgi.py, если settings.WARMUP_ON_START включен.
+Если приложение загружается до fork (например, gunicorn --preload),
+warm_up() нужно вызывать в каждом дочернем процессе (хук post_fork),
+иначе соединения с базой будут общими для процессов.
+"""
+import logging
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+WARMUP_URLS = (
+    ('titles-list', {}),
+    ('titles-detail', {'pk': 1}),
+    ('reviews-list', {'title_id': 1}),
+    ('comments-list', {'title_id': 1, 'review_id': 1}),
+    ('users-list', {}),
+    ('category', {}),
+    ('genres', {}),
+)
+
+
+def compile_urls():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for name, kwargs in WARMUP_URLS:
+        resolver.resolve(reverse(name, kwargs=kwargs))
+
+
+def build_serializers():
+    from api import serializers
+    for serializer_class in (
+        serializers.UserSerializer,
+        serializers.YamdbRoleSerializer,
+        serializers.ReviewSerializer,
+        serializers.CommentSerializer,
+        serializers.CategorySerializer,
+        serializers.GenreSerializer,
+        serializers.TitleSerializer,
+    ):
+        serializer_class().fields
+
+
+def connect_databases():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def fill_caches():
+    from api.cache import get_title_cards
+    from api.facets import genre_bitmaps
+    from title.lookups import categories, genres
+    from title.models import Title
+    genres.all()
+    categories.all()
+    genre_bitmaps.refresh()
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    get_title_cards(list(
+        Title.objects.order_by('pk').values_list('id', flat=True)[:page_size]
+    ))
+
+
+def warm_up():
+    """
+    Импортирует модули api, компилирует URL-шаблоны router_v1,
+    строит поля сериализаторов, подключается к базам данных,
+    загружает таблицы жанров и категорий, индекс жанров для фасетов
+    и заполняет кэш карточек первой страницы произведений.
+    Ошибки базы данных и кэша не мешают запуску воркера:
+    прогрев только ускоряет первые запросы.
+    """
+    import api.views  # noqa: F401
+    compile_urls()
+    build_serializers()
+    try:
+        connect_databases()
+        fill_caches()
+    except Exception:
+        logger.warning(
+            'Warm-up skipped database and cache steps', exc_info=True
+        )
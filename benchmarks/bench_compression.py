@@ -0,0 +1,69 @@
+"""
+Бенчмарк сжатия ответов: размер страницы из 100 отзывов с длинным текстом
+и время сжатия каждой доступной кодировкой (CompressionMiddleware).
+"""
+import argparse
+import random
+
+from .common import measure, setup_django
+
+WORDS = (
+    'фильм сюжет актер режиссер сцена финал герой музыка драма '
+    'история зритель роль кадр камера диалог смысл эпизод '
+    'movie plot actor scene ending music story camera'
+).split()
+
+
+def create_reviews(count, length):
+    from review.models import Review
+    from title.models import Title
+    from user.models import User
+
+    title = Title.objects.create(name='Benchmark', year=2000)
+    users = User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(count)
+    )
+    rng = random.Random(0)
+    Review.objects.bulk_create(
+        Review(
+            author=user,
+            title=title,
+            score=rng.randint(1, 10),
+            text=' '.join(rng.choice(WORDS) for _ in range(length))
+        )
+        for user in users
+    )
+    return title
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reviews', type=int, default=100)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.test import Client
+
+    from api_yamdb.middleware import get_available_encoders
+
+    title = create_reviews(args.reviews, args.words)
+    url = f'/api/v1/titles/{title.id}/reviews/'
+    client = Client()
+    body = client.get(url, HTTP_ACCEPT_ENCODING='identity').content
+    print(f'{"encoding":<10}{"bytes":>10}{"ratio":>8}{"cpu, ms":>10}')
+    print(f'{"identity":<10}{len(body):>10}{1:>8.2f}{0:>10.2f}')
+    for encoder in get_available_encoders():
+        compressed = encoder.compress(body)
+        cpu = measure(lambda: encoder.compress(body), args.repeat)
+        ratio = len(body) / len(compressed)
+        print(f'{encoder.name:<10}{len(compressed):>10}{ratio:>8.2f}'
+              f'{cpu:>10.2f}')
+        response = client.get(url, HTTP_ACCEPT_ENCODING=encoder.name)
+        assert response['Content-Encoding'] == encoder.name
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Бенчмарк накладных расходов middleware на запрос к API для профилей
+настроек api_yamdb.settings (полный, с админкой) и api_yamdb.settings_api
+(только API). Цепочки middleware каждого профиля собираются вокруг
+пустого представления, поэтому замеряется только их собственная работа.
+"""
+import argparse
+import importlib
+
+from .common import measure, setup_django
+
+PROFILES = ('api_yamdb.settings', 'api_yamdb.settings_api')
+
+
+def build_chain(middleware):
+    from django.http import JsonResponse
+    from django.utils.module_loading import import_string
+
+    def handler(request):
+        return JsonResponse({'results': []})
+
+    for path in reversed(middleware):
+        handler = import_string(path)(handler)
+    return handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='/api/v1/titles/')
+    parser.add_argument('--repeat', type=int, default=20000)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    for profile in PROFILES:
+        middleware = importlib.import_module(profile).MIDDLEWARE
+        chain = build_chain(middleware)
+
+        def request():
+            chain(factory.get(
+                args.url, HTTP_AUTHORIZATION='Bearer token'
+            ))
+
+        elapsed = measure(request, args.repeat) * 1000
+        print(f'{profile:<26}{len(middleware):>3} middleware'
+              f'{elapsed:>10.1f} us/request')
+
+
+if __name__ == '__main__':
+    main()
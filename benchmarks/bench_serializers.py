@@ -0,0 +1,50 @@
+"""
+Бенчмарк создания сериализаторов api: время импорта api.serializers
+и построения полей сериализатора с кэшем CachedFieldsMixin и без него.
+"""
+import argparse
+import time
+
+from .common import measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+    setup_django()
+
+    start = time.perf_counter()
+    from api import serializers
+    import_ms = (time.perf_counter() - start) * 1000
+    from rest_framework.serializers import ModelSerializer
+
+    from title.models import Title
+    from title.validators import validate_year
+
+    print(f'import api.serializers, ms: {import_ms:.2f}')
+    print(f'{"serializer":<22}{"uncached, us":>14}{"cached, us":>12}')
+    for serializer_class in (
+        serializers.TitleSerializer,
+        serializers.ReviewSerializer,
+        serializers.UserSerializer,
+    ):
+        serializer = serializer_class()
+        uncached = measure(
+            lambda: ModelSerializer.get_fields(serializer), args.repeat
+        ) * 1000
+        cached = measure(serializer.get_fields, args.repeat) * 1000
+        print(f'{serializer_class.__name__:<22}{uncached:>14.1f}'
+              f'{cached:>12.1f}')
+
+    title = Title(name='Benchmark', year=2000)
+    full = measure(
+        lambda: serializers.TitleSerializer(title).data, args.repeat
+    ) * 1000
+    year = measure(lambda: validate_year(2000), args.repeat) * 1000
+    print(f'TitleSerializer(title).data, us: {full:.1f}')
+    print(f'validate_year, us: {year:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Бенчмарк списка и поиска пользователей `/api/v1/users/`.
+Сравнивает keyset-пагинацию и поиск по префиксу с OFFSET-страницами
+и поиском LIKE '%x%', которые использовались раньше.
+"""
+import argparse
+
+from .common import measure, report, setup_django
+
+BATCH_SIZE = 10000
+
+
+def create_users(count):
+    from user.models import User
+    for start in range(0, count, BATCH_SIZE):
+        User.objects.bulk_create(
+            User(
+                username=f'user{i}', username_lower=f'user{i}',
+                email=f'user{i}@yamdb.fake', email_lower=f'user{i}@yamdb.fake'
+            )
+            for i in range(start, min(start + BATCH_SIZE, count))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from user.models import User
+
+    create_users(args.users)
+    admin = User.objects.create_superuser(
+        username='bench_admin', email='admin@yamdb.fake', password='bench'
+    )
+    token = RefreshToken.for_user(admin).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    last_id = User.objects.order_by('-id').values_list('id', flat=True)[200]
+    offset = args.users - 200
+
+    def old_deep_page():
+        list(User.objects.all()[offset:offset + 100])
+
+    def old_search():
+        list(User.objects.filter(username__contains='user12345')[:100])
+
+    report([
+        ('api first page, ms',
+         measure(lambda: client.get('/api/v1/users/'), args.repeat)),
+        ('api keyset deep page, ms',
+         measure(lambda: client.get(f'/api/v1/users/?after={last_id}'),
+                 args.repeat)),
+        ('api prefix search, ms',
+         measure(lambda: client.get('/api/v1/users/?search=user12345'),
+                 args.repeat)),
+        ('orm offset deep page (old), ms',
+         measure(old_deep_page, args.repeat)),
+        ('orm contains search (old), ms',
+         measure(old_search, args.repeat)),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Общие функции бенчмарков. Бенчмарки запускаются из корня проекта:
+
+    python -m benchmarks.bench_users --users 1000000
+
+База данных - тестовая (для sqlite - в памяти), рабочая база не меняется.
+"""
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(settings_module='api_yamdb.settings'):
+    sys.path.insert(0, BASE_DIR)
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    os.environ.setdefault('S_KEY', 'benchmark')
+    import django
+    django.setup()
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    from django.db import connection
+    connection.creation.create_test_db(verbosity=0)
+
+
+def measure(func, repeat=20):
+    """
+    Вызывает func repeat раз, возвращает медиану времени в миллисекундах.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(rows):
+    width = max(len(name) for name, _ in rows)
+    for name, value in rows:
+        print(f'{name:<{width}}  {value:>10.2f}')
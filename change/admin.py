@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from change.models import Change
+
+
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'model', 'object_id', 'action', 'created')
+    list_filter = ('model', 'action')
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ChangeConfig(AppConfig):
+    name = 'change'
+
+    def ready(self):
+        from . import signals  # noqa: F401
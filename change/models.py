@@ -0,0 +1,74 @@
+from django.db import models
+
+
+class ChangeActions(models.TextChoices):
+    """
+    Список действий журнала изменений.
+    """
+    CREATE = ('create', 'create',)
+    UPDATE = ('update', 'update',)
+    DELETE = ('delete', 'delete',)
+
+
+# Модели, изменения которых попадают в журнал: label - имя в журнале.
+TRACKED_MODELS = {
+    'title.Title': 'title',
+    'title.Category': 'category',
+    'title.Genre': 'genre',
+    'review.Review': 'review',
+    'comment.Comment': 'comment',
+}
+
+
+class Change(models.Model):
+    """
+    Модель Change(Изменение). Запись журнала изменений, только добавление.
+    Поле id - монотонный номер изменения, по нему читается журнал.
+    Поле model - имя модели (title, category, genre, review, comment).
+    Поле object_id - id измененного объекта.
+    Поле action - create, update или delete.
+    Поле created - время изменения, cоздается автоматически.
+    """
+    model = models.CharField(max_length=20, verbose_name='Модель')
+    object_id = models.PositiveIntegerField(verbose_name='id объекта')
+    action = models.CharField(
+        max_length=10,
+        choices=ChangeActions.choices,
+        verbose_name='Действие'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Время изменения'
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Изменения'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.id}: {self.action} {self.model} {self.object_id}'
+
+    @classmethod
+    def record(cls, model, object_id, action):
+        name = TRACKED_MODELS.get(model._meta.label)
+        if name is not None:
+            cls.objects.create(model=name, object_id=object_id, action=action)
+
+    @classmethod
+    def record_many(cls, model, ids, action):
+        """
+        Записывает действие над пакетом объектов одним INSERT.
+        Используется при изменениях без сигналов
+        (api.deletion, api.review_queue).
+        """
+        name = TRACKED_MODELS.get(model._meta.label)
+        if name is not None:
+            cls.objects.bulk_create(
+                cls(model=name, object_id=object_id, action=action)
+                for object_id in ids
+            )
+
+    @classmethod
+    def record_deleted(cls, model, ids):
+        cls.record_many(model, ids, ChangeActions.DELETE)
@@ -0,0 +1,49 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from comment.models import Comment
+from review.models import Review
+from title.models import Category, Genre, Title
+from .models import Change, ChangeActions
+
+
+def record_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    Change.record(
+        sender,
+        instance.pk,
+        ChangeActions.CREATE if created else ChangeActions.UPDATE
+    )
+
+
+def record_delete(sender, instance, **kwargs):
+    Change.record(sender, instance.pk, ChangeActions.DELETE)
+
+
+def record_title_genre(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # После очистки жанра со стороны Genre pk_set равен None:
+        # id его произведений запоминаются до удаления связей.
+        instance._cleared_title_ids = list(sender.objects.filter(
+            genre=instance
+        ).values_list('title_id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        Change.record(Title, instance.pk, ChangeActions.UPDATE)
+    elif action == 'post_clear':
+        Change.record_many(
+            Title,
+            instance.__dict__.pop('_cleared_title_ids', ()),
+            ChangeActions.UPDATE
+        )
+    elif pk_set:
+        for title_id in pk_set:
+            Change.record(Title, title_id, ChangeActions.UPDATE)
+
+
+for model in (Title, Category, Genre, Review, Comment):
+    post_save.connect(record_save, sender=model)
+    post_delete.connect(record_delete, sender=model)
+m2m_changed.connect(record_title_genre, sender=Title.genre.through)
@@ -1,6 +1,8 @@
 import textwrap
+from uuid import uuid4
 
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.signals import post_save, pre_save
 
 from review.models import Review
 from title.models import Title
@@ -15,6 +17,11 @@ class Comment(models.Model):
     Поле author(Автор) внешний ключ на модель User(Пользователь).
     Поле pub_date(Дата публикации), cоздается автоматически.
     Поле text(Текст Комментария).
+    Поле parent(Ответ на) внешний ключ на модель Comment, необязательное.
+    Поле path(Путь в ветке) - id комментария и всех его предков от корня,
+    по 10 цифр через '/', заполняется при создании. Ветка комментария -
+    все комментарии отзыва, путь которых начинается с его пути,
+    и читается одним диапазоном по индексу (review, path).
     """
     review = models.ForeignKey(
         Review,
@@ -44,11 +51,68 @@ class Comment(models.Model):
         db_index=True
     )
     text = models.TextField(verbose_name='Текст Комментария')
+    parent = models.ForeignKey(
+        'self',
+        verbose_name='Ответ на',
+        on_delete=models.CASCADE,
+        related_name='replies',
+        blank=True,
+        null=True
+    )
+    path = models.CharField(
+        verbose_name='Путь в ветке',
+        max_length=255,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', 'path'), name='comment_review_path_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='comment_author_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return textwrap.shorten(self.text, 15, placeholder='...')
+
+    @property
+    def depth(self):
+        return self.path.count('/') - 1
+
+    def save(self, *args, **kwargs):
+        """
+        Путь нового комментария содержит его id, поэтому строка вставляется
+        через bulk_create (без сигналов) со случайным сегментом той же
+        длины, затем путь обновляется в той же транзакции. pre_save и
+        post_save отправляются вокруг обеих записей: получатели post_save
+        видят заполненный path.
+        """
+        if self.path or not self._state.adding:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(
+            Comment, instance=self)
+        comments = Comment.objects.using(using)
+        with transaction.atomic(using=using):
+            pre_save.send(sender=Comment, instance=self, raw=False,
+                          using=using, update_fields=None)
+            prefix = self.parent.path if self.parent_id else ''
+            self.path = f'{prefix}{uuid4().hex[:10]}/'
+            comments.bulk_create([self])
+            if self.pk is None:
+                self.pk = comments.filter(
+                    review_id=self.review_id, path=self.path,
+                ).values_list('pk', flat=True).get()
+            self.path = f'{prefix}{self.pk:010d}/'
+            comments.filter(pk=self.pk).update(path=self.path)
+            self._state.adding = False
+            self._state.db = using
+            post_save.send(sender=Comment, instance=self, created=True,
+                           update_fields=None, raw=False, using=using)
@@ -0,0 +1,61 @@
+from functools import reduce
+from operator import or_
+
+from django.db.models import (CharField, Count, IntegerField, OuterRef, Q,
+                              Subquery, Value)
+from django.db.models.functions import Coalesce, Concat
+
+from api_yamdb.queries import prefix_q
+from .models import Comment
+
+# Сколько веток объединяет один queryset with_replies().
+REPLY_RANGES_BATCH_SIZE = 100
+
+
+def annotate_reply_count(queryset):
+    """
+    Добавляет к комментариям reply_count - количество ответов в ветке.
+    Ответы комментария - комментарии того же отзыва, путь которых
+    длиннее и начинается с его пути: подзапрос читает диапазон
+    path > путь AND path < путь + '\\uffff' по индексу (review, path).
+    """
+    replies = Comment.objects.filter(
+        review_id=OuterRef('review_id'),
+        path__gt=OuterRef('path'),
+        path__lt=Concat(
+            OuterRef('path'), Value('\uffff'), output_field=CharField()
+        ),
+    ).order_by().values('review_id').annotate(
+        count=Count('id')
+    ).values('count')
+    return queryset.annotate(reply_count=Coalesce(
+        Subquery(replies, output_field=IntegerField()), 0
+    ))
+
+
+def with_replies(comments, batch_size=REPLY_RANGES_BATCH_SIZE):
+    """
+    Комментарии comments и все ответы на них в их ветках в виде списка
+    queryset, от самых глубоких к корню (по убыванию path): при удалении
+    в таком порядке ответы удаляются раньше комментариев, на которые
+    они отвечают.
+    Пути комментариев читаются один раз; комментарии внутри уже
+    выбранной ветки пропускаются, а каждая ветка - диапазон по индексу
+    (review, path). Один queryset объединяет до batch_size веток.
+    """
+    roots = []
+    for review_id, path in comments.order_by(
+        'review_id', 'path'
+    ).values_list('review_id', 'path'):
+        if roots and roots[-1][0] == review_id and path.startswith(
+            roots[-1][1]
+        ):
+            continue
+        roots.append((review_id, path))
+    return [
+        Comment.objects.filter(reduce(or_, (
+            Q(review_id=review_id) & prefix_q('path', path)
+            for review_id, path in roots[start:start + batch_size]
+        ))).order_by('-path')
+        for start in range(0, len(roots), batch_size)
+    ]
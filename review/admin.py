@@ -1,8 +1,12 @@
 from django.contrib import admin
 
+from api.deletion import bulk_delete_action, delete_review
 from review.models import Review
 
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ('id', 'author', 'title', 'pub_date', 'score', 'text')
+    actions = (bulk_delete_action(
+        delete_review, 'Удалить вместе с комментариями (пакетно)'
+    ),)
@@ -0,0 +1,71 @@
+# Generated by Django 3.0.5 on 2026-10-19 17:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('review', '0010_merge_20210331_0000'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewVote',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Время голоса')),
+            ],
+            options={
+                'verbose_name': 'Голос за отзыв',
+                'verbose_name_plural': 'Голоса за отзывы',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewVoteShard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='Номер части')),
+                ('count', models.IntegerField(default=0, verbose_name='Изменение счетчика')),
+            ],
+            options={
+                'verbose_name': 'Часть счетчика голосов',
+                'verbose_name_plural': 'Части счетчика голосов',
+            },
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpful_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Полезный'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-helpful_count', '-id'], name='review_title_helpful_idx'),
+        ),
+        migrations.AddField(
+            model_name='reviewvoteshard',
+            name='review',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_shards', to='review.Review', verbose_name='Отзыв'),
+        ),
+        migrations.AddField(
+            model_name='reviewvote',
+            name='review',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='review.Review', verbose_name='Отзыв'),
+        ),
+        migrations.AddField(
+            model_name='reviewvote',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_votes', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewvoteshard',
+            constraint=models.UniqueConstraint(fields=('review', 'shard'), name='unique_review_vote_shard'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewvote',
+            constraint=models.UniqueConstraint(fields=('review', 'user'), name='unique_review_vote'),
+        ),
+    ]
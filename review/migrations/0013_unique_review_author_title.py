@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_reviews(apps, schema_editor):
+    Review = apps.get_model('review', 'Review')
+    duplicates = Review.objects.filter(
+        author__isnull=False, title__isnull=False
+    ).order_by().values('author_id', 'title_id').annotate(
+        total=Count('id')
+    ).filter(total__gt=1).count()
+    if duplicates:
+        raise RuntimeError(
+            f'Найдено повторных отзывов (автор, произведение): {duplicates}. '
+            'Удалите их командой '
+            '`python manage.py delete_duplicate_reviews --delete` '
+            'и повторите миграцию.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0012_author_pub_date_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('author', 'title'), name='unique_review_author_title'),
+        ),
+    ]
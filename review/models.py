@@ -15,6 +15,10 @@ class Review(models.Model):
     Поле pub_date(Дата публикации), cоздается автоматически.
     Поле score(Оценка), оценка на произведение.
     Поле text(Текст Отзыва).
+    Поле helpful_count(Полезный) - количество голосов "полезно"
+    (ReviewVote), изменяется через review.votes. Сохранение существующего
+    отзыва без update_fields не записывает helpful_count, чтобы
+    не затереть голоса, добавленные после чтения отзыва.
     """
     author = models.ForeignKey(
         User,
@@ -41,11 +45,104 @@ class Review(models.Model):
         validators=[MaxValueValidator(10), MinValueValidator(1)]
     )
     text = models.TextField(verbose_name='Текст отзыва')
+    helpful_count = models.IntegerField(
+        verbose_name='Полезный',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('title', '-helpful_count', '-id'),
+                name='review_title_helpful_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='review_author_pub_date_idx'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('author', 'title'), name='unique_review_author_title'
+            ),
+        )
 
     def __str__(self):
         return textwrap.shorten(self.text, 15, placeholder='...', )
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'helpful_count'
+            ]
+        super().save(*args, **kwargs)
+
+
+class ReviewVote(models.Model):
+    """
+    Модель ReviewVote(Голос за отзыв). Голос "полезно",
+    один от пользователя на отзыв.
+    """
+    review = models.ForeignKey(
+        Review,
+        verbose_name='Отзыв',
+        on_delete=models.CASCADE,
+        related_name='votes'
+    )
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='review_votes'
+    )
+    created = models.DateTimeField(
+        verbose_name='Время голоса',
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = 'Голос за отзыв'
+        verbose_name_plural = 'Голоса за отзывы'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('review', 'user'), name='unique_review_vote'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.review_id}'
+
+
+class ReviewVoteShard(models.Model):
+    """
+    Модель ReviewVoteShard(Часть счетчика голосов).
+    Если settings.REVIEW_VOTE_SHARDS больше 1, изменения счетчика
+    голосов отзыва распределяются по строкам shard, чтобы одновременные
+    голоса за популярный отзыв не ждали блокировку одной строки.
+    Команда fold_review_votes переносит count в Review.helpful_count.
+    """
+    review = models.ForeignKey(
+        Review,
+        verbose_name='Отзыв',
+        on_delete=models.CASCADE,
+        related_name='vote_shards'
+    )
+    shard = models.PositiveSmallIntegerField(verbose_name='Номер части')
+    count = models.IntegerField(verbose_name='Изменение счетчика', default=0)
+
+    class Meta:
+        verbose_name = 'Часть счетчика голосов'
+        verbose_name_plural = 'Части счетчика голосов'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('review', 'shard'), name='unique_review_vote_shard'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.review_id}/{self.shard}: {self.count}'
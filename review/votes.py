@@ -0,0 +1,148 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+
+from .models import Review, ReviewVote, ReviewVoteShard
+
+
+def _add_to_shard(review_id, delta):
+    shard = random.randrange(settings.REVIEW_VOTE_SHARDS)
+    shards = ReviewVoteShard.objects.filter(review_id=review_id, shard=shard)
+    if shards.update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            ReviewVoteShard.objects.create(
+                review_id=review_id, shard=shard, count=delta
+            )
+    except IntegrityError:
+        shards.update(count=F('count') + delta)
+
+
+def change_helpful_count(review_id, delta):
+    """
+    Изменяет счетчик голосов отзыва на delta атомарным UPDATE с F().
+    Если settings.REVIEW_VOTE_SHARDS больше 1, изменение записывается
+    в случайную часть счетчика (ReviewVoteShard), а в helpful_count
+    его переносит fold_vote_shards().
+    """
+    if settings.REVIEW_VOTE_SHARDS > 1:
+        _add_to_shard(review_id, delta)
+    else:
+        Review.objects.filter(pk=review_id).update(
+            helpful_count=F('helpful_count') + delta
+        )
+
+
+def get_helpful_count(review_id):
+    """
+    Точное количество голосов: helpful_count и еще не перенесенные
+    части счетчика.
+    """
+    count = Review.objects.filter(
+        pk=review_id
+    ).values_list('helpful_count', flat=True).first() or 0
+    if settings.REVIEW_VOTE_SHARDS > 1:
+        count += ReviewVoteShard.objects.filter(
+            review_id=review_id
+        ).aggregate(pending=Sum('count'))['pending'] or 0
+    return count
+
+
+def add_vote(review, user):
+    """
+    Голос пользователя за отзыв. Повторный голос ничего не меняет.
+    Возвращает True, если голос добавлен.
+    """
+    try:
+        with transaction.atomic():
+            ReviewVote.objects.create(review=review, user=user)
+            change_helpful_count(review.pk, 1)
+    except IntegrityError:
+        return False
+    return True
+
+
+def remove_vote(review, user):
+    """
+    Отменяет голос пользователя. Возвращает True, если голос был.
+    """
+    with transaction.atomic():
+        deleted, _ = ReviewVote.objects.filter(
+            review=review, user=user
+        ).delete()
+        if deleted:
+            change_helpful_count(review.pk, -1)
+    return bool(deleted)
+
+
+def remove_user_votes(user, chunk_size=500):
+    """
+    Удаляет голоса пользователя и уменьшает счетчики отзывов,
+    за которые он голосовал (api.deletion). Голоса обрабатываются
+    пакетами по chunk_size: пакет блокируется (select_for_update),
+    удаляется, и счетчики его отзывов уменьшаются одним UPDATE в той же
+    транзакции, поэтому одновременная отмена того же голоса
+    (remove_vote) не уменьшит счетчик второй раз.
+    Возвращает количество удаленных голосов.
+    """
+    removed = 0
+    while True:
+        with transaction.atomic():
+            votes = list(ReviewVote.objects.select_for_update().filter(
+                user=user
+            ).order_by('id').values_list('id', 'review_id')[:chunk_size])
+            if not votes:
+                return removed
+            ReviewVote.objects.filter(
+                id__in=[pk for pk, _ in votes]
+            ).delete()
+            Review.objects.filter(
+                id__in=[review_id for _, review_id in votes]
+            ).update(helpful_count=F('helpful_count') - 1)
+        removed += len(votes)
+
+
+def _case_by_id(values):
+    return Case(
+        *(When(id=pk, then=Value(value)) for pk, value in values.items()),
+        default=Value(0),
+        output_field=IntegerField()
+    )
+
+
+def fold_vote_shards(batch_size=None):
+    """
+    Переносит накопленные части счетчиков в Review.helpful_count,
+    не больше batch_size (settings.REVIEW_VOTE_FOLD_BATCH_SIZE) частей
+    за вызов: один UPDATE отзывов и один UPDATE частей в транзакции.
+    Из части вычитается перенесенное значение, а не записывается 0:
+    select_for_update блокирует части не на всех СУБД (на SQLite - нет),
+    и голос, добавленный в часть во время переноса, не теряется.
+    Возвращает количество перенесенных частей.
+    """
+    if batch_size is None:
+        batch_size = settings.REVIEW_VOTE_FOLD_BATCH_SIZE
+    with transaction.atomic():
+        shards = list(ReviewVoteShard.objects.select_for_update().exclude(
+            count=0
+        ).order_by('id').values_list('id', 'review_id', 'count')[
+            :batch_size
+        ])
+        if not shards:
+            return 0
+        totals = defaultdict(int)
+        for _, review_id, count in shards:
+            totals[review_id] += count
+        Review.objects.filter(id__in=totals).update(
+            helpful_count=F('helpful_count') + _case_by_id(totals)
+        )
+        ReviewVoteShard.objects.filter(
+            id__in=[pk for pk, _, _ in shards]
+        ).update(count=F('count') - _case_by_id({
+            pk: count for pk, _, count in shards
+        }))
+    return len(shards)
@@ -0,0 +1,38 @@
+import pytest
+
+from .common import auth_client, create_reviews
+
+
+class Test07PermissionsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_can_edit(self, client, user_client, admin):
+        reviews, titles, user, moderator = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = auth_client(user).get(url)
+        assert response.status_code == 200
+        can_edit = {
+            item['id']: item['can_edit']
+            for item in response.json()['results']
+        }
+        assert can_edit == {
+            reviews[0]['id']: False,
+            reviews[1]['id']: True,
+            reviews[2]['id']: False,
+        }, (
+            'Проверьте, что поле `can_edit` в списке отзывов равно True '
+            'только для отзывов автора'
+        )
+
+        response = auth_client(moderator).get(url)
+        assert all(item['can_edit'] for item in response.json()['results']), (
+            'Проверьте, что модератор может изменять все отзывы'
+        )
+
+        response = client.get(url)
+        assert not any(
+            item['can_edit'] for item in response.json()['results']
+        ), (
+            'Проверьте, что анонимный пользователь не может изменять отзывы'
+        )
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from api.throttling import local_buckets
+
+
+class Test08AuthThrottleAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_email_throttle(self, client, settings):
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        local_buckets.clear()
+        data = {'email': 'throttle@yamdb.fake'}
+        for _ in range(5):
+            response = client.post('/api/v1/auth/email/', data=data)
+            assert response.status_code == 200, (
+                'Проверьте, что POST запрос `/api/v1/auth/email/` '
+                'в пределах лимита возвращает статус 200'
+            )
+        response = client.post('/api/v1/auth/email/', data=data)
+        assert response.status_code == 429, (
+            'Проверьте, что при превышении лимита запросов для одного email '
+            '`/api/v1/auth/email/` возвращает статус 429'
+        )
+        response = client.post(
+            '/api/v1/auth/email/', data={'email': 'other@yamdb.fake'}
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что лимит для email не влияет на другие адреса'
+        )
+        local_buckets.clear()
+
+    def test_02_cache_buckets_clear(self):
+        from django.core.cache import caches
+
+        from api.throttling import CacheTokenBuckets, parse_rate
+
+        assert parse_rate('5/min') == (5, 60)
+        assert parse_rate(None) == (None, None)
+        cache = caches['default']
+        cache.set('unrelated', 1)
+        buckets = CacheTokenBuckets('default')
+        buckets.set('throttle:test', (1, 0), 60)
+        assert buckets.get('throttle:test') == (1, 0)
+        buckets.clear()
+        assert buckets.get('throttle:test') is None, (
+            'Проверьте, что clear() сбрасывает ведра throttle'
+        )
+        assert cache.get('unrelated') == 1, (
+            'Проверьте, что clear() не очищает остальные ключи кэша'
+        )
+        cache.delete('unrelated')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_non_object_body(self, client):
+        local_buckets.clear()
+        for url, body in (
+            ('/api/v1/auth/email/', [1, 2]), ('/api/v1/auth/token/', [1])
+        ):
+            response = client.post(
+                url, data=json.dumps(body), content_type='application/json'
+            )
+            assert response.status_code == 400, (
+                f'Проверьте, что POST запрос `{url}` с телом не в виде '
+                'объекта возвращает статус 400'
+            )
+        local_buckets.clear()
@@ -0,0 +1,51 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test09DeletionAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_delete_title_in_chunks(self, user_client, admin):
+        from api.deletion import delete_title
+        from comment.models import Comment
+        from review.models import Review
+        from title.models import Title
+
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        title = Title.objects.get(id=titles[0]['id'])
+        progress = []
+        counts = delete_title(
+            title, chunk_size=2,
+            progress=lambda model, deleted: progress.append(deleted)
+        )
+        assert counts == {
+            'comment.Comment': len(comments),
+            'review.Review': len(reviews),
+            'review.ReviewVote': 0,
+            'review.ReviewVoteShard': 0,
+            'title.Title': 1,
+        }, (
+            'Проверьте, что delete_title удаляет произведение вместе '
+            'с отзывами и комментариями'
+        )
+        assert progress == [2, 3, 2, 3], (
+            'Проверьте, что удаление выполняется пакетами по chunk_size'
+        )
+        assert not Review.objects.filter(title_id=titles[0]['id']).exists()
+        assert not Comment.objects.filter(title_id=titles[0]['id']).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_delete_user_api(self, user_client, admin):
+        from comment.models import Comment
+        from review.models import Review
+
+        comments, reviews, titles, user, _ = create_comments(user_client, admin)
+        response = user_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204, (
+            'Проверьте, что DELETE запрос `/api/v1/users/{username}/` '
+            'возвращает статус 204'
+        )
+        assert not Review.objects.filter(author_id=user.id).exists()
+        assert not Comment.objects.filter(author_id=user.id).exists()
+        assert Comment.objects.count() == len(comments) - 1
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+import pytest
+
+from .common import auth_client, create_reviews
+
+
+class Test10ExportAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_permissions(self, client, user_client, admin):
+        _, _, user, _ = create_reviews(user_client, admin)
+        response = client.get('/api/v1/export/review.ndjson')
+        assert response.status_code == 401, (
+            'Проверьте, что выгрузка без токена возвращает статус 401'
+        )
+        response = auth_client(user).get('/api/v1/export/review.ndjson')
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+        response = user_client.get('/api/v1/export/unknown.ndjson')
+        assert response.status_code == 404, (
+            'Проверьте, что выгрузка неизвестного набора возвращает статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_formats(self, user_client, admin):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        response = user_client.get('/api/v1/export/review.ndjson')
+        assert response.status_code == 200
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert [row['id'] for row in rows] == [
+            review['id'] for review in reviews
+        ], (
+            'Проверьте, что выгрузка NDJSON содержит все отзывы'
+        )
+
+        response = user_client.get('/api/v1/export/titles.csv')
+        assert response.status_code == 200
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert list(rows[0])[:5] == [
+            'id', 'name', 'year', 'description', 'category'
+        ], (
+            'Проверьте, что заголовок CSV совпадает со схемой data/titles.csv'
+        )
+        assert float(rows[0]['rating']) == 4.0
+        assert len(rows) == len(titles)
@@ -0,0 +1,80 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test11ChangesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_changes(self, client, user_client, admin, settings):
+        settings.CHANGES_COMMIT_LAG = 0
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        response = client.get('/api/v1/changes/')
+        assert response.status_code == 401, (
+            'Проверьте, что журнал изменений недоступен анонимному '
+            'пользователю'
+        )
+        response = user_client.get('/api/v1/changes/')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/changes/` возвращает статус 200'
+        )
+        data = response.json()
+        seqs = [change['seq'] for change in data['results']]
+        assert seqs == sorted(seqs) and data['next_since'] == seqs[-1], (
+            'Проверьте, что изменения упорядочены по номеру seq'
+        )
+        created = {
+            (change['model'], change['object_id'])
+            for change in data['results'] if change['action'] == 'create'
+        }
+        assert {('review', review['id']) for review in reviews} <= created
+        assert {('comment', comment['id']) for comment in comments} <= created
+
+        since = data['next_since']
+        user_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        response = user_client.get(f'/api/v1/changes/?since={since}')
+        changes = {
+            (change['model'], change['object_id'], change['action'])
+            for change in response.json()['results']
+        }
+        assert changes == {('review', reviews[0]['id'], 'delete')} | {
+            ('comment', comment['id'], 'delete') for comment in comments
+        }, (
+            'Проверьте, что `/api/v1/changes/?since=` возвращает только '
+            'изменения после since, включая удаления'
+        )
+
+        response = user_client.get('/api/v1/changes/?since=-1')
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_commit_lag(self, user_client, admin, settings):
+        settings.CHANGES_COMMIT_LAG = 60
+        create_comments(user_client, admin)
+        data = user_client.get('/api/v1/changes/').json()
+        assert data == {'results': [], 'next_since': 0}, (
+            'Проверьте, что `/api/v1/changes/` не возвращает изменения '
+            'моложе CHANGES_COMMIT_LAG секунд'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_stop_at_unsettled(self, user_client, admin, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from change.models import Change
+
+        settings.CHANGES_COMMIT_LAG = 60
+        create_comments(user_client, admin)
+        ids = list(Change.objects.values_list('id', flat=True))
+        Change.objects.update(created=timezone.now() - timedelta(hours=1))
+        Change.objects.filter(id=ids[2]).update(created=timezone.now())
+        data = user_client.get('/api/v1/changes/').json()
+        assert [change['seq'] for change in data['results']] == ids[:2], (
+            'Проверьте, что `/api/v1/changes/` останавливается перед '
+            'первым изменением моложе CHANGES_COMMIT_LAG секунд'
+        )
+        assert data['next_since'] == ids[1]
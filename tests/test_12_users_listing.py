@@ -0,0 +1,59 @@
+import pytest
+
+
+class Test12UsersListingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_keyset_pagination(self, user_client, admin, django_user_model):
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{i}', email=f'user{i}@yamdb.fake')
+            for i in range(150)
+        )
+        response = user_client.get('/api/v1/users/')
+        data = response.json()
+        assert data['count'] == 151 and len(data['results']) == 100, (
+            'Проверьте, что первая страница `/api/v1/users/` содержит count '
+            'и 100 пользователей'
+        )
+        assert set(data['results'][0]) == {
+            'first_name', 'last_name', 'username', 'bio', 'email', 'role'
+        }
+        assert 'after=' in data['next'], (
+            'Проверьте, что ссылка next содержит параметр `after`'
+        )
+        response = user_client.get(data['next'])
+        data = response.json()
+        assert len(data['results']) == 51 and data['next'] is None, (
+            'Проверьте, что последняя страница содержит оставшихся '
+            'пользователей и next равен None'
+        )
+        response = user_client.get('/api/v1/users/?after=abc')
+        assert response.status_code == 400
+        response = user_client.get('/api/v1/users/?page=2')
+        data = response.json()
+        assert response.status_code == 200 and len(data['results']) == 51, (
+            'Проверьте, что номер страницы `page` продолжает работать'
+        )
+        assert data['count'] == 151 and data['next'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_prefix_search(self, user_client, admin, django_user_model):
+        django_user_model.objects.create(
+            username='alice', email='alice@yamdb.fake'
+        )
+        django_user_model.objects.create(
+            username='bob', email='malice@yamdb.fake'
+        )
+        response = user_client.get('/api/v1/users/?search=ali')
+        usernames = [user['username'] for user in response.json()['results']]
+        assert usernames == ['alice'], (
+            'Проверьте, что поиск `search` ищет по началу username и email'
+        )
+        response = user_client.get('/api/v1/users/?search=malice@')
+        usernames = [user['username'] for user in response.json()['results']]
+        assert usernames == ['bob']
+        response = user_client.get('/api/v1/users/?search=ALI')
+        usernames = [user['username'] for user in response.json()['results']]
+        assert usernames == ['alice'], (
+            'Проверьте, что поиск `search` не учитывает регистр'
+        )
@@ -0,0 +1,39 @@
+import pytest
+
+
+class Test13UsersMeAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_me_queries(self, user_client, admin,
+                           django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/users/me/` возвращает '
+            'статус 200 и использует только запрос аутентификации'
+        )
+        data = {
+            'username': admin.username,
+            'email': admin.email,
+            'bio': 'new bio',
+        }
+        with django_assert_num_queries(2):
+            response = user_client.patch('/api/v1/users/me/', data=data)
+        assert response.status_code == 200, (
+            'Проверьте, что PATCH запрос `/api/v1/users/me/` с неизменными '
+            'username и email не проверяет их уникальность в базе'
+        )
+        assert response.json()['bio'] == 'new bio'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_me_unique(self, user_client, admin, django_user_model):
+        django_user_model.objects.create(
+            username='taken', email='taken@yamdb.fake'
+        )
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'email': 'taken@yamdb.fake'}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что PATCH запрос `/api/v1/users/me/` с email '
+            'другого пользователя возвращает статус 400'
+        )
@@ -0,0 +1,112 @@
+import pytest
+from django.core import mail
+
+from api.throttling import local_buckets
+
+
+class Test14AuthCodeAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_code_flow(self, client, settings, django_user_model):
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        local_buckets.clear()
+        email = 'code@yamdb.fake'
+        response = client.post('/api/v1/auth/email/', data={'email': email})
+        assert response.status_code == 200
+        code = mail.outbox[-1].body.rsplit(' ', 1)[-1]
+
+        response = client.post(
+            '/api/v1/auth/token/', data={'email': email, 'code': 'wrong'}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что POST запрос `/api/v1/auth/token/` '
+            'с неверным кодом возвращает статус 400'
+        )
+        response = client.post(
+            '/api/v1/auth/token/', data={'email': email, 'code': code}
+        )
+        assert response.status_code == 200 and 'token' in response.json(), (
+            'Проверьте, что POST запрос `/api/v1/auth/token/` '
+            'с верным кодом возвращает token'
+        )
+        assert django_user_model.objects.filter(
+            email=email, username=email
+        ).exists(), (
+            'Проверьте, что при первом получении токена создается пользователь'
+        )
+        response = client.post(
+            '/api/v1/auth/token/', data={'email': email, 'code': code}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что код подтверждения можно использовать один раз'
+        )
+        local_buckets.clear()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_email_case(self, client, django_user_model):
+        from api.confirmation import consume_code, issue_code
+
+        user = django_user_model.objects.create(
+            username='mixed', email='Mixed@Yamdb.fake'
+        )
+        code = issue_code('mixed@yamdb.fake')
+        assert consume_code('MIXED@yamdb.fake', code)
+        assert not consume_code('mixed@yamdb.fake', code), (
+            'Проверьте, что код подтверждения можно использовать один раз'
+        )
+
+        local_buckets.clear()
+        response = client.post('/api/v1/auth/token/', data={
+            'email': 'MIXED@yamdb.fake', 'code': issue_code('mixed@yamdb.fake')
+        })
+        assert response.status_code == 200
+        assert django_user_model.objects.count() == 1, (
+            'Проверьте, что пользователь ищется по email без учета регистра'
+        )
+
+        django_user_model.objects.create(
+            username='mixed2', email=user.email.upper()
+        )
+        response = client.post('/api/v1/auth/token/', data={
+            'email': user.email, 'code': issue_code(user.email)
+        })
+        assert response.status_code == 400, (
+            'Проверьте, что email нескольких пользователей '
+            'возвращает статус 400'
+        )
+        local_buckets.clear()
+
+    def test_03_shared_cache_check(self, settings):
+        from api.checks import check_shared_caches
+
+        assert [warning.id for warning in check_shared_caches(None)] == [
+            'api.W001'
+        ], 'Проверьте, что кэш в памяти процесса дает одно предупреждение'
+        settings.CACHES = {**settings.CACHES, 'recommendations': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }}
+        settings.RECOMMENDATIONS_CACHE = 'recommendations'
+        assert any(
+            'RECOMMENDATIONS_CACHE' in warning.msg
+            for warning in check_shared_caches(None)
+        ), 'Проверьте, что проверяется и кэш рекомендаций'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_code_kept_on_failure(self, client, django_user_model):
+        from api.confirmation import issue_code
+
+        local_buckets.clear()
+        email = 'taken@yamdb.fake'
+        other = django_user_model.objects.create(
+            username=email, email='other@yamdb.fake'
+        )
+        data = {'email': email, 'code': issue_code(email)}
+        response = client.post('/api/v1/auth/token/', data=data)
+        assert response.status_code == 400
+        other.delete()
+        response = client.post('/api/v1/auth/token/', data=data)
+        assert response.status_code == 200, (
+            'Проверьте, что код подтверждения не расходуется, '
+            'если пользователя не удалось получить'
+        )
+        local_buckets.clear()
@@ -0,0 +1,39 @@
+import gzip
+
+import pytest
+
+from .common import create_reviews
+
+
+class Test15CompressionAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_gzip(self, client, user_client, admin, settings):
+        settings.COMPRESSION_MIN_LENGTH = 100
+        _, titles, _, _ = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что ответ сжимается gzip, если клиент его принимает'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        plain = client.get(url, HTTP_ACCEPT_ENCODING='identity')
+        assert not plain.has_header('Content-Encoding')
+        assert gzip.decompress(response.content) == plain.content
+
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что кодировка с q=0 не используется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_streaming(self, user_client, admin):
+        create_reviews(user_client, admin)
+        response = user_client.get(
+            '/api/v1/export/review.ndjson', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response['Content-Encoding'] == 'gzip'
+        content = gzip.decompress(b''.join(response.streaming_content))
+        assert len(content.splitlines()) == 3, (
+            'Проверьте, что потоковые ответы сжимаются целиком'
+        )
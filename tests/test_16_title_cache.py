@@ -0,0 +1,67 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test16TitleCacheAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_card_invalidation(self, client, user_client, admin,
+                                        django_user_model):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] == 4
+
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from rest_framework.test import APIClient
+        author = django_user_model.objects.create(
+            username='critic', email='critic@yamdb.fake'
+        )
+        author_client = APIClient()
+        author_client.credentials(HTTP_AUTHORIZATION=(
+            f'Bearer {RefreshToken.for_user(author).access_token}'
+        ))
+        author_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'отлично', 'score': 8}
+        )
+        assert client.get(url).json()['rating'] == 5, (
+            'Проверьте, что новый отзыв обновляет rating в кэше карточки'
+        )
+
+        user_client.patch(url, data={'name': 'Новое название'})
+        response = client.get('/api/v1/titles/')
+        names = [title['name'] for title in response.json()['results']]
+        assert 'Новое название' in names, (
+            'Проверьте, что изменение произведения обновляет список'
+        )
+
+        from title.models import Genre
+        genre = Genre.objects.get(slug=titles[0]['genre'][0])
+        genre.name = 'Переименован'
+        genre.save()
+        genres = [genre['name'] for genre in client.get(url).json()['genre']]
+        assert 'Переименован' in genres, (
+            'Проверьте, что изменение жанра обновляет карточки произведений'
+        )
+        assert client.get('/api/v1/titles/999/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bump_after_commit(self, user_client):
+        from django.db import transaction
+
+        from api.cache import get_title_cards
+        from title.models import Title
+
+        titles, _, _ = create_titles(user_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        get_title_cards([title.pk])
+        with transaction.atomic():
+            title.name = 'Внутри транзакции'
+            title.save()
+            assert get_title_cards([title.pk])[0]['name'] != title.name, (
+                'Проверьте, что версия карточки не сбрасывается до COMMIT'
+            )
+        assert get_title_cards([title.pk])[0]['name'] == title.name, (
+            'Проверьте, что версия карточки сбрасывается после COMMIT'
+        )
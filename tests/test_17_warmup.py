@@ -0,0 +1,29 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test17WarmUp:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_warm_up(self, user_client, django_assert_num_queries):
+        from api_yamdb.warmup import warm_up
+
+        titles, _, _ = create_titles(user_client)
+        warm_up()
+        with django_assert_num_queries(3):
+            response = user_client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == len(titles), (
+            'Проверьте, что после прогрева карточки произведений '
+            'берутся из кэша: запросы только на аутентификацию, count и id страницы'
+        )
+
+    def test_02_cache_error(self, monkeypatch):
+        from api_yamdb import warmup
+
+        def fail():
+            raise ConnectionError('cache is down')
+
+        monkeypatch.setattr(warmup, 'connect_databases', lambda: None)
+        monkeypatch.setattr(warmup, 'fill_caches', fail)
+        warmup.warm_up()
@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test18LookupsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_without_lookup_queries(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?genre=drama')
+            client.get('/api/v1/titles/?category=films')
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id']
+        ]
+        assert data['results'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
+        tables = ('"title_genre"', '"title_category"')
+        assert not [
+            query for query in context.captured_queries
+            if any(table in query['sql'] for table in tables)
+        ], (
+            'Проверьте, что жанры и категории берутся из таблиц в памяти, '
+            'без запросов к таблицам жанров и категорий'
+        )
+        response = client.get('/api/v1/titles/?genre=unknown')
+        assert response.json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_slug_validation(self, user_client):
+        create_titles(user_client)
+        response = user_client.post('/api/v1/titles/', data={
+            'name': 'Новое', 'year': 2000, 'genre': ['unknown'],
+            'category': 'films'
+        })
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестный slug жанра возвращает статус 400'
+        )
+        user_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'}
+        )
+        response = user_client.post('/api/v1/titles/', data={
+            'name': 'Новое', 'year': 2000, 'genre': ['new'],
+            'category': 'films'
+        })
+        assert response.status_code == 201, (
+            'Проверьте, что новый жанр сразу доступен для произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_miss_falls_back_to_database(self, user_client):
+        from title.lookups import genres
+        from title.models import Genre
+
+        create_titles(user_client)
+        assert genres.get_by_slug('other') is None
+        Genre.objects.bulk_create([Genre(name='Другой', slug='other')])
+        genre = genres.get_by_slug('other')
+        assert genre is not None and genre.name == 'Другой', (
+            'Проверьте, что жанр, созданный на другом воркере, '
+            'находится в базе при промахе таблицы в памяти'
+        )
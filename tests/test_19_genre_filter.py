@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test19GenreFilterAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_multiple_genres(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        user_client.post('/api/v1/titles/', data={
+            'name': 'Третье', 'year': 2010, 'genre': ['horror', 'drama'],
+            'category': 'films'
+        })
+
+        def ids(url):
+            response = client.get(url)
+            return [title['id'] for title in response.json()['results']]
+
+        assert ids('/api/v1/titles/?genre=horror,drama') == [
+            titles[0]['id'], titles[1]['id'], titles[1]['id'] + 1
+        ], (
+            'Проверьте, что genre=a,b возвращает произведения '
+            'с любым из жанров без дублей'
+        )
+        assert ids('/api/v1/titles/?genre=horror,drama&genre_match=all') == [
+            titles[1]['id'] + 1
+        ], (
+            'Проверьте, что genre_match=all возвращает произведения '
+            'со всеми жанрами сразу'
+        )
+        assert ids('/api/v1/titles/?genre=horror,unknown&genre_match=all') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_single_scan(self, client, user_client):
+        create_titles(user_client)
+        with CaptureQueriesContext(connection) as context:
+            client.get('/api/v1/titles/?genre=horror,comedy,drama')
+        page_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "title_title"' in query['sql']
+            and '"title_title_genre"' in query['sql']
+        ]
+        assert len(page_queries) == 2, (
+            'Не найдены запросы count и страницы произведений'
+        )
+        for sql in page_queries:
+            assert 'JOIN' not in sql and 'EXISTS' in sql, (
+                'Проверьте, что фильтр по жанрам использует подзапрос EXISTS '
+                'без JOIN, и страница читается одним проходом по title_title'
+            )
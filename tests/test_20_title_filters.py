@@ -0,0 +1,62 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test20TitleFiltersAPI:
+
+    @staticmethod
+    def ids(client, url):
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_year_category_name(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        first, second = titles[0]['id'], titles[1]['id']
+
+        assert self.ids(client, '/api/v1/titles/?year_min=2001') == [second], (
+            'Проверьте, что year_min отбирает произведения не старше года'
+        )
+        assert self.ids(client, '/api/v1/titles/?year_max=2000') == [first], (
+            'Проверьте, что year_max отбирает произведения не позже года'
+        )
+        assert self.ids(
+            client, '/api/v1/titles/?year_min=1990&year_max=2030'
+        ) == [first, second]
+        assert self.ids(
+            client, '/api/v1/titles/?category=films,books'
+        ) == [first, second], (
+            'Проверьте, что category=a,b отбирает произведения '
+            'любой из категорий'
+        )
+        assert self.ids(client, '/api/v1/titles/?category=books') == [second]
+        assert self.ids(client, '/api/v1/titles/?category=unknown') == []
+        assert self.ids(client, '/api/v1/titles/?name_prefix=ПОВОР') == [
+            first
+        ], (
+            'Проверьте, что name_prefix ищет по началу названия '
+            'без учета регистра'
+        )
+        assert self.ids(client, '/api/v1/titles/?name_prefix=туда') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rating_min(self, client, user_client, admin):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        first = titles[0]['id']
+
+        assert self.ids(client, '/api/v1/titles/?rating_min=4') == [first], (
+            'Проверьте, что rating_min отбирает произведения '
+            'по хранимому рейтингу'
+        )
+        assert self.ids(client, '/api/v1/titles/?rating_min=4.5') == []
+
+        user_client.delete(
+            f'/api/v1/titles/{first}/reviews/{reviews[1]["id"]}/'
+        )
+        assert self.ids(client, '/api/v1/titles/?rating_min=4.5') == [
+            first
+        ], 'Проверьте, что удаление отзыва пересчитывает рейтинг'
@@ -0,0 +1,82 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test21FacetsAPI:
+
+    @staticmethod
+    def counts(facets):
+        return {facet['slug']: facet['count'] for facet in facets}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_facets(self, client, user_client):
+        from api.facets import genre_bitmaps
+        genre_bitmaps.invalidate()
+        titles, _, _ = create_titles(user_client)
+
+        response = client.get('/api/v1/titles/facets/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/facets/` '
+            'возвращается статус 200'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert self.counts(data['genre']) == {
+            'horror': 1, 'comedy': 1, 'drama': 1
+        }, 'Проверьте, что возвращается количество произведений по жанрам'
+        assert self.counts(data['category']) == {'films': 1, 'books': 1}
+        assert data['decade'] == [
+            {'decade': 2000, 'count': 1}, {'decade': 2020, 'count': 1}
+        ]
+
+        data = client.get('/api/v1/titles/facets/?year_min=2001').json()
+        assert data['count'] == 1
+        assert self.counts(data['genre']) == {'drama': 1}, (
+            'Проверьте, что фасеты учитывают фильтры списка произведений'
+        )
+
+        user_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/',
+            data={'genre': ['horror', 'drama']}
+        )
+        data = client.get('/api/v1/titles/facets/').json()
+        assert self.counts(data['genre']) == {
+            'horror': 2, 'comedy': 1, 'drama': 1
+        }, 'Проверьте, что индекс жанров обновляется при изменении жанров'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_single_title_query(self, client, user_client, settings):
+        from api.facets import genre_bitmaps
+        settings.CHANGES_COMMIT_LAG = 0
+        genre_bitmaps.invalidate()
+        create_titles(user_client)
+        client.get('/api/v1/titles/facets/')
+
+        with CaptureQueriesContext(connection) as context:
+            client.get('/api/v1/titles/facets/')
+        title_queries = [
+            query['sql'] for query in context.captured_queries
+            if '"title_title' in query['sql']
+        ]
+        assert len(title_queries) == 1, (
+            'Проверьте, что фасеты читают произведения одним запросом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reverse_clear(self, client, user_client, settings):
+        from api.facets import genre_bitmaps
+        from title.models import Genre
+
+        settings.CHANGES_COMMIT_LAG = 0
+        genre_bitmaps.invalidate()
+        create_titles(user_client)
+        client.get('/api/v1/titles/facets/')
+        Genre.objects.get(slug='drama').titles.clear()
+        data = client.get('/api/v1/titles/facets/').json()
+        assert 'drama' not in self.counts(data['genre']), (
+            'Проверьте, что очистка произведений жанра со стороны жанра '
+            'обновляет индекс фасетов'
+        )
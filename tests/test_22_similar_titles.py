@@ -0,0 +1,67 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test22SimilarTitlesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_similar(self, client, user_client):
+        titles, _, _ = create_titles(user_client)
+        third = user_client.post('/api/v1/titles/', data={
+            'name': 'Третье', 'year': 2010, 'genre': ['drama'],
+            'category': 'films'
+        }).json()
+        first, second, third = titles[0]['id'], titles[1]['id'], third['id']
+        users = create_users_api(user_client)
+        for user, scores in zip(users, ((9, 8, 2), (8, 9, 3))):
+            user_api = auth_client(user)
+            for title_id, score in zip((first, second, third), scores):
+                user_api.post(
+                    f'/api/v1/titles/{title_id}/reviews/',
+                    data={'text': 'отзыв', 'score': score}
+                )
+
+        response = client.get(f'/api/v1/titles/{first}/similar/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/similar/` '
+            'возвращается статус 200'
+        )
+        assert response.json() == [], (
+            'Проверьте, что до расчета похожих произведений список пуст'
+        )
+
+        call_command('build_similar_titles', top_k=5, min_common=2)
+        data = client.get(f'/api/v1/titles/{first}/similar/').json()
+        assert [title['id'] for title in data] == [second], (
+            'Проверьте, что похожими считаются произведения, '
+            'которые пользователи оценили схоже'
+        )
+        assert data[0]['name'] == titles[1]['name']
+        assert [
+            title['id'] for title in
+            client.get(f'/api/v1/titles/{second}/similar/').json()
+        ] == [first]
+        assert client.get(
+            f'/api/v1/titles/{third}/similar/'
+        ).json() == []
+
+        response = client.get(f'/api/v1/titles/{third + 100}/similar/')
+        assert response.status_code == 404, (
+            'Проверьте, что для несуществующего произведения '
+            'возвращается статус 404'
+        )
+
+    def test_02_max_reviews(self):
+        from api.similarity import compute_similar_titles
+
+        rows = [
+            (1, 10, 9), (1, 20, 1), (1, 30, 9),
+            (2, 10, 9), (2, 20, 1), (2, 30, 9),
+        ]
+        assert set(compute_similar_titles(rows, 5, 1, 3)) == {10, 30}
+        assert compute_similar_titles(rows, 5, 1, 2) == {}, (
+            'Проверьте, что учитываются только max_reviews последних '
+            'отзывов пользователя'
+        )
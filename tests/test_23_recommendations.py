@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test23RecommendationsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_recommendations(self, client, user_client,
+                                django_assert_num_queries):
+        titles, _, _ = create_titles(user_client)
+        third = user_client.post('/api/v1/titles/', data={
+            'name': 'Третье', 'year': 2010, 'genre': ['drama'],
+            'category': 'films'
+        }).json()
+        first, second, third = titles[0]['id'], titles[1]['id'], third['id']
+        users = create_users_api(user_client)
+        for user, scores in zip(users, ((9, 8, 2), (8, 9, 3))):
+            user_api = auth_client(user)
+            for title_id, score in zip((first, second, third), scores):
+                user_api.post(
+                    f'/api/v1/titles/{title_id}/reviews/',
+                    data={'text': 'отзыв', 'score': score}
+                )
+        call_command('build_similar_titles', top_k=5, min_common=2)
+
+        url = '/api/v1/users/me/recommendations/'
+        response = client.get(url)
+        assert response.status_code == 401, (
+            f'Проверьте, что при GET запросе `{url}` без токена '
+            'возвращается статус 401'
+        )
+        user_client.post(
+            f'/api/v1/titles/{first}/reviews/',
+            data={'text': 'отзыв', 'score': 10}
+        )
+        response = user_client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` с токеном '
+            'возвращается статус 200'
+        )
+        assert [title['id'] for title in response.json()] == [second], (
+            'Проверьте, что рекомендуются непросмотренные произведения, '
+            'похожие на оцененные пользователем'
+        )
+        with django_assert_num_queries(1):
+            user_client.get(url)
+
+        user_client.post(
+            f'/api/v1/titles/{second}/reviews/',
+            data={'text': 'отзыв', 'score': 9}
+        )
+        assert user_client.get(url).json() == [], (
+            'Проверьте, что новый отзыв убирает произведение из рекомендаций'
+        )
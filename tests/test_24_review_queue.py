@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test24ReviewQueueAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_write_behind(self, client, user_client, settings, tmp_path):
+        settings.REVIEW_WRITE_BEHIND = True
+        settings.REVIEW_QUEUE_PATH = str(tmp_path / 'queue.sqlite3')
+        titles, _, _ = create_titles(user_client)
+        title_id = titles[0]['id']
+        user, moderator = create_users_api(user_client)
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        response = user_client.post(url, data={'text': 'отзыв', 'score': 4})
+        assert response.status_code == 202, (
+            'Проверьте, что в режиме отложенной записи POST отзыва '
+            'возвращает статус 202'
+        )
+        assert response.json()['score'] == 4
+        response = user_client.post(url, data={'text': 'повтор', 'score': 10})
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв, ждущий в очереди, '
+            'возвращает статус 400'
+        )
+        auth_client(user).post(url, data={'text': 'отзыв', 'score': 8})
+        auth_client(moderator).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'отзыв', 'score': 7}
+        )
+        response = user_client.post(url, data={'text': 'отзыв', 'score': 11})
+        assert response.status_code == 400, (
+            'Проверьте, что отзыв проверяется до постановки в очередь'
+        )
+        assert client.get(url).json()['count'] == 0, (
+            'Проверьте, что отзывы из очереди не записываются в базу сразу'
+        )
+
+        call_command('flush_review_queue', batch_size=2)
+
+        data = client.get(url).json()
+        assert sorted(
+            review['score'] for review in data['results']
+        ) == [4, 8], (
+            'Проверьте, что отзывы переносятся из очереди в базу, '
+            'а повторный отзыв автора пропускается'
+        )
+        assert client.get(f'/api/v1/titles/{title_id}/').json()['rating'] == 6, (
+            'Проверьте, что рейтинг пересчитывается после переноса отзывов'
+        )
+        assert client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/'
+        ).json()['rating'] == 7
+
+        from api.review_queue import get_review_queue
+        assert len(get_review_queue()) == 0, (
+            'Проверьте, что перенесенные отзывы удаляются из очереди'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_threads_and_conflicts(self, user_client, admin, settings,
+                                      tmp_path):
+        import threading
+
+        from api.review_queue import (_create_reviews, enqueue_review,
+                                      get_review_queue)
+        from review.models import Review
+
+        settings.REVIEW_QUEUE_PATH = str(tmp_path / 'queue.sqlite3')
+        titles, _, _ = create_titles(user_client)
+        enqueue_review(admin.id, titles[0]['id'], 'отзыв', 5)
+        errors = []
+
+        def put():
+            try:
+                enqueue_review(admin.id, titles[1]['id'], 'отзыв', 6)
+            except Exception as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=put)
+        thread.start()
+        thread.join()
+        assert not enqueue_review(admin.id, titles[1]['id'], 'повтор', 1)
+        assert not errors and len(get_review_queue()) == 2, (
+            'Проверьте, что очередь можно использовать из разных потоков'
+        )
+
+        Review.objects.create(
+            author=admin, title_id=titles[0]['id'], text='синхронно', score=3
+        )
+        created = _create_reviews([
+            Review(author=admin, title_id=title['id'], text='отзыв', score=5)
+            for title in titles[:2]
+        ])
+        assert [review.title_id for review in created] == [titles[1]['id']], (
+            'Проверьте, что отзыв, созданный синхронно, '
+            'не ломает перенос пакета'
+        )
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test25DeferredRatingsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_deferred_ratings(self, client, user_client, settings):
+        from api.ratings import update_dirty_ratings
+        from title.models import DirtyTitle
+
+        settings.RATING_UPDATE_MODE = 'deferred'
+        settings.RATING_DEBOUNCE = 60
+        settings.RATING_MAX_STALENESS = 300
+        titles, _, _ = create_titles(user_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        user, moderator = create_users_api(user_client)
+        for author_client, score in (
+            (user_client, 4), (auth_client(user), 6), (auth_client(moderator), 8)
+        ):
+            author_client.post(
+                f'/api/v1/titles/{title_id}/reviews/',
+                data={'text': 'отзыв', 'score': score}
+            )
+
+        assert DirtyTitle.objects.count() == 1, (
+            'Проверьте, что отзывы к одному произведению '
+            'дают одну отметку для пересчета'
+        )
+        assert client.get(url).json()['rating'] is None, (
+            'Проверьте, что в режиме deferred рейтинг не пересчитывается сразу'
+        )
+        call_command('update_ratings')
+        assert client.get(url).json()['rating'] is None, (
+            'Проверьте, что рейтинг не пересчитывается, '
+            'пока отзывы продолжают меняться'
+        )
+
+        assert update_dirty_ratings(
+            now=timezone.now() + timedelta(seconds=301)
+        ) == 1, (
+            'Проверьте, что рейтинг пересчитывается '
+            'не позже RATING_MAX_STALENESS'
+        )
+        assert client.get(url).json()['rating'] == 6
+        assert DirtyTitle.objects.count() == 0
+
+        settings.RATING_DEBOUNCE = 0
+        user_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/'
+            f'{client.get(f"/api/v1/titles/{title_id}/reviews/").json()["results"][0]["id"]}/'
+        )
+        call_command('update_ratings')
+        assert client.get(url).json()['rating'] == 7, (
+            'Проверьте, что удаление отзыва отмечает рейтинг для пересчета'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_save_keeps_rating(self, user_client):
+        from title.models import Title
+
+        titles, _, _ = create_titles(user_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        Title.objects.filter(pk=title.pk).update(rating=7)
+        title.name = 'Переименовано'
+        title.save()
+        title.refresh_from_db()
+        assert (title.name_lower, title.rating) == ('переименовано', 7), (
+            'Проверьте, что сохранение произведения не затирает rating'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_keep_marks_during_recompute(self, user_client, settings,
+                                            monkeypatch):
+        from api import ratings
+        from title.models import DirtyTitle
+
+        settings.RATING_UPDATE_MODE = 'deferred'
+        titles, _, _ = create_titles(user_client)
+        title_id = titles[0]['id']
+        ratings.mark_titles_dirty([title_id])
+        update_title_ratings = ratings.update_title_ratings
+
+        def update_and_mark(title_ids):
+            update_title_ratings(title_ids)
+            ratings.mark_titles_dirty([title_id])
+
+        monkeypatch.setattr(ratings, 'update_title_ratings', update_and_mark)
+        assert ratings.update_dirty_ratings(
+            now=timezone.now() + timedelta(seconds=301)
+        ) == 1
+        assert DirtyTitle.objects.filter(title_id=title_id).exists(), (
+            'Проверьте, что отметка, сделанная во время пересчета, '
+            'сохраняется'
+        )
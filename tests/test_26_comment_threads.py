@@ -0,0 +1,130 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+
+class Test26CommentThreadsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_threads(self, client, user_client, admin):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+
+        def post(text, parent=None):
+            data = {'text': text}
+            if parent is not None:
+                data['parent'] = parent
+            response = user_client.post(url, data=data)
+            assert response.status_code == 201, (
+                'Проверьте, что ответ на комментарий создается, '
+                'возвращается статус 201'
+            )
+            return response.json()
+
+        first = post('первый')
+        second = post('второй')
+        reply = post('ответ', first['id'])
+        nested = post('ответ на ответ', reply['id'])
+        assert reply['parent'] == first['id']
+        assert nested['depth'] == 2, (
+            'Проверьте, что возвращается глубина комментария в ветке'
+        )
+
+        other_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[1]["id"]}/comments/'
+        )
+        response = user_client.post(
+            other_url, data={'text': 'чужой', 'parent': first['id']}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что нельзя ответить на комментарий другого отзыва'
+        )
+
+        data = client.get(url + '?ordering=thread').json()
+        assert [comment['id'] for comment in data['results']] == [
+            first['id'], reply['id'], nested['id'], second['id']
+        ], 'Проверьте, что ordering=thread возвращает комментарии по веткам'
+        assert [comment['reply_count'] for comment in data['results']] == [
+            2, 1, 0, 0
+        ], 'Проверьте, что reply_count считает все ответы в ветке'
+
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url + f'?subtree={reply["id"]}').json()
+        range_queries = [
+            query['sql'] for query in context.captured_queries
+            if '"comment_comment"."path" >=' in query['sql']
+        ]
+        assert len(range_queries) == 2, (
+            'Проверьте, что ветка читается диапазоном по path: '
+            'запросы count и страницы'
+        )
+        assert [comment['id'] for comment in data['results']] == [
+            reply['id'], nested['id']
+        ], 'Проверьте, что subtree возвращает комментарий и ответы на него'
+        assert client.get(url + '?subtree=0').status_code == 404
+
+        user_client.delete(url + f'{reply["id"]}/')
+        data = client.get(url + '?ordering=thread').json()
+        assert [comment['id'] for comment in data['results']] == [
+            first['id'], second['id']
+        ], 'Проверьте, что удаление комментария удаляет ответы на него'
+        assert data['results'][0]['reply_count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_delete_user_with_replies(self, client, user_client, admin):
+        from api.deletion import delete_user
+
+        reviews, titles, user, _ = create_reviews(user_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        comment = auth_client(user).post(url, data={'text': 'вопрос'}).json()
+        reply = user_client.post(
+            url, data={'text': 'ответ', 'parent': comment['id']}
+        ).json()
+        user_client.post(url, data={'text': 'ответ', 'parent': reply['id']})
+        kept = user_client.post(url, data={'text': 'отдельно'}).json()
+
+        counts = delete_user(user, chunk_size=1)
+        assert counts['comment.Comment'] == 3, (
+            'Проверьте, что вместе с комментарием пользователя '
+            'удаляются ответы на него'
+        )
+        data = client.get(url).json()
+        assert [item['id'] for item in data['results']] == [kept['id']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_path_before_post_save(self, user_client, admin):
+        from django.db.models.signals import post_save
+
+        from comment.models import Comment
+
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        paths = []
+
+        def receiver(sender, instance, created, **kwargs):
+            paths.append(instance.path)
+
+        post_save.connect(receiver, sender=Comment)
+        try:
+            comment = user_client.post(url, data={'text': 'вопрос'}).json()
+            user_client.post(
+                url, data={'text': 'ответ', 'parent': comment['id']}
+            )
+        finally:
+            post_save.disconnect(receiver, sender=Comment)
+        assert paths == [
+            f'{comment["id"]:010d}/',
+            f'{comment["id"]:010d}/{comment["id"] + 1:010d}/',
+        ], 'Проверьте, что path заполнен до сигнала post_save'
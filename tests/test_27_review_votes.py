@@ -0,0 +1,113 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test27ReviewVotesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_votes(self, client, user_client, admin):
+        reviews, titles, user, moderator = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        helpful_url = url + f'{reviews[0]["id"]}/helpful/'
+
+        response = client.post(helpful_url)
+        assert response.status_code == 401, (
+            'Проверьте, что голосовать может только '
+            'аутентифицированный пользователь'
+        )
+        response = user_client.post(helpful_url)
+        assert response.status_code == 400, (
+            'Проверьте, что автор не может голосовать за свой отзыв'
+        )
+        for voter in (user, moderator):
+            response = auth_client(voter).post(helpful_url)
+            assert response.status_code == 200, (
+                f'Проверьте, что при POST запросе `{helpful_url}` '
+                'возвращается статус 200'
+            )
+        assert response.json()['helpful_count'] == 2
+        response = auth_client(moderator).post(helpful_url)
+        assert response.json()['helpful_count'] == 2, (
+            'Проверьте, что повторный голос не увеличивает счетчик'
+        )
+        auth_client(moderator).post(url + f'{reviews[1]["id"]}/helpful/')
+
+        data = client.get(url + '?ordering=helpful').json()
+        assert [review['id'] for review in data['results']] == [
+            reviews[0]['id'], reviews[1]['id'], reviews[2]['id']
+        ], 'Проверьте, что ordering=helpful сортирует по числу голосов'
+        assert data['results'][0]['helpful_count'] == 2
+
+        response = auth_client(user).delete(helpful_url)
+        assert response.json()['helpful_count'] == 1, (
+            'Проверьте, что DELETE отменяет голос'
+        )
+
+        from api.deletion import delete_user
+        delete_user(moderator)
+        data = client.get(url + '?ordering=helpful').json()
+        assert [review['helpful_count'] for review in data['results']] == [
+            0, 0
+        ], 'Проверьте, что удаление пользователя снимает его голоса'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_sharded_votes(self, client, user_client, admin, settings):
+        settings.REVIEW_VOTE_SHARDS = 4
+        reviews, titles, user, moderator = create_reviews(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        helpful_url = url + f'{reviews[0]["id"]}/helpful/'
+
+        auth_client(user).post(helpful_url)
+        response = auth_client(moderator).post(helpful_url)
+        assert response.json()['helpful_count'] == 2, (
+            'Проверьте, что ответ содержит точный счетчик '
+            'с учетом частей счетчика'
+        )
+        review_url = url + f'{reviews[0]["id"]}/'
+        assert client.get(review_url).json()['helpful_count'] == 0
+        call_command('fold_review_votes')
+        assert client.get(review_url).json()['helpful_count'] == 2, (
+            'Проверьте, что fold_review_votes переносит части '
+            'счетчика в helpful_count'
+        )
+        auth_client(user).delete(helpful_url)
+        call_command('fold_review_votes')
+        assert client.get(review_url).json()['helpful_count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_save_keeps_votes(self, user_client, admin):
+        from review.models import Review
+
+        reviews, _, _, _ = create_reviews(user_client, admin)
+        review = Review.objects.get(pk=reviews[0]['id'])
+        Review.objects.filter(pk=review.pk).update(helpful_count=5)
+        review.text = 'исправлено'
+        review.save()
+        review.refresh_from_db()
+        assert (review.text, review.helpful_count) == ('исправлено', 5), (
+            'Проверьте, что сохранение отзыва не затирает счетчик голосов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_fold_in_batches(self, user_client, admin, settings):
+        from review.models import Review, ReviewVoteShard
+        from review.votes import fold_vote_shards, get_helpful_count
+
+        settings.REVIEW_VOTE_SHARDS = 4
+        reviews, _, _, _ = create_reviews(user_client, admin)
+        review_id = reviews[0]['id']
+        ReviewVoteShard.objects.bulk_create(
+            ReviewVoteShard(review_id=review_id, shard=shard, count=shard + 1)
+            for shard in range(3)
+        )
+        assert fold_vote_shards(batch_size=2) == 2, (
+            'Проверьте, что fold_vote_shards переносит не больше '
+            'batch_size частей за вызов'
+        )
+        assert Review.objects.get(pk=review_id).helpful_count == 3
+        assert get_helpful_count(review_id) == 6
+        assert fold_vote_shards(batch_size=2) == 1
+        assert fold_vote_shards(batch_size=2) == 0
+        assert Review.objects.get(pk=review_id).helpful_count == 6
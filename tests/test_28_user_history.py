@@ -0,0 +1,62 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test28UserHistoryAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_history(self, client, user_client, admin, monkeypatch,
+                        django_assert_num_queries):
+        from api.pagination import HistoryCursorPagination
+        monkeypatch.setattr(HistoryCursorPagination, 'page_size', 1)
+
+        titles, _, _ = create_titles(user_client)
+        review_ids = []
+        for title in titles:
+            response = user_client.post(
+                f'/api/v1/titles/{title["id"]}/reviews/',
+                data={'text': 'отзыв', 'score': 5}
+            )
+            review_ids.append(response.json()['id'])
+        comments_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{review_ids[0]}/comments/'
+        )
+        comment_ids = [
+            user_client.post(comments_url, data={'text': text}).json()['id']
+            for text in ('первый', 'второй')
+        ]
+
+        url = f'/api/v1/users/{admin.username}/reviews/'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        data = response.json()
+        assert [review['id'] for review in data['results']] == [
+            review_ids[1]
+        ], 'Проверьте, что отзывы пользователя идут от новых к старым'
+        assert data['next'], (
+            'Проверьте, что возвращается ссылка на следующую страницу'
+        )
+        data = client.get(data['next']).json()
+        assert [review['id'] for review in data['results']] == [
+            review_ids[0]
+        ]
+        assert data['next'] is None
+
+        data = client.get(f'/api/v1/users/{admin.username}/comments/').json()
+        assert [comment['id'] for comment in data['results']] == [
+            comment_ids[1]
+        ], 'Проверьте, что комментарии пользователя идут от новых к старым'
+        assert client.get(data['next']).json()['results'][0]['id'] == (
+            comment_ids[0]
+        )
+
+        response = client.get('/api/v1/users/unknown/reviews/')
+        assert response.status_code == 404, (
+            'Проверьте, что для несуществующего пользователя '
+            'возвращается статус 404'
+        )
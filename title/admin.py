@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from api.deletion import bulk_delete_action, delete_title
 from .models import Category, Genre, Title
 
 
@@ -9,6 +10,9 @@ class TitleAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('category', 'genre')
     empty_value_display = '-пусто-'
+    actions = (bulk_delete_action(
+        delete_title, 'Удалить вместе с отзывами и комментариями (пакетно)'
+    ),)
 
 
 @admin.register(Category)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TitleConfig(AppConfig):
     name = 'title'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,22 +1,83 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
+from api_yamdb.queries import prefix_q
+from .lookups import categories, genres
 from .models import Title
 
 
 class TitleFilter(filters.FilterSet):
     """
     Фильтр для поиска произведений:
-    Сортировка по полю slug(Путь жанра) модели Genre(Жанр), точное соотвествие.
+    Сортировка по полю slug(Путь жанра) модели Genre(Жанр), точное соотвествие,
+    несколько жанров через запятую: genre=drama,comedy. По умолчанию
+    подходит любой из жанров, с genre_match=all - все жанры сразу.
     Сортировка по полю slug(Путь категории) модели Category(Категория),
-    точное соотвествие.
+    точное соотвествие, несколько категорий через запятую.
     Сортировка по полю name(Название произведения) модели Title(Произведение),
     не точное соотвестие - содержит.
-    Сортировка по полю year(Год) модели Title(Произведение),точное соотвествие.
+    name_prefix - название начинается с (без учета регистра), поиск
+    диапазоном по индексированному полю name_lower.
+    Сортировка по полю year(Год) модели Title(Произведение),точное соотвествие,
+    year_min и year_max - диапазон лет включительно.
+    rating_min - рейтинг не ниже, по хранимому полю rating.
+    Slug жанра и категории переводятся в id по таблицам в памяти
+    (title.lookups), поэтому таблицы жанров и категорий не присоединяются.
+    Жанры проверяются подзапросами EXISTS к таблице связей без JOIN,
+    поэтому строки произведений не дублируются.
     """
-    genre = filters.CharFilter(field_name='genre__slug')
-    category = filters.CharFilter(field_name='category__slug')
+    genre = filters.CharFilter(method='filter_genre')
+    genre_match = filters.ChoiceFilter(
+        choices=(('any', 'any'), ('all', 'all')),
+        method='filter_genre_match'
+    )
+    category = filters.CharFilter(method='filter_category')
     name = filters.CharFilter(field_name='name', lookup_expr='contains')
+    name_prefix = filters.CharFilter(method='filter_name_prefix')
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = filters.NumberFilter(field_name='rating', lookup_expr='gte')
 
     class Meta:
         model = Title
         fields = ('genre', 'category', 'year',)
+
+    @staticmethod
+    def _split_slugs(value):
+        return {slug.strip() for slug in value.split(',') if slug.strip()}
+
+    def filter_genre(self, queryset, name, value):
+        slugs = self._split_slugs(value)
+        ids = set()
+        for slug in slugs:
+            genre = genres.get_by_slug(slug)
+            if genre is not None:
+                ids.add(genre.id)
+        match_all = self.form.cleaned_data.get('genre_match') == 'all'
+        if not ids or (match_all and len(ids) < len(slugs)):
+            return queryset.none()
+        links = Title.genre.through.objects.filter(title_id=OuterRef('pk'))
+        if not match_all:
+            return queryset.filter(Exists(links.filter(genre_id__in=ids)))
+        for genre_id in ids:
+            queryset = queryset.filter(Exists(links.filter(genre_id=genre_id)))
+        return queryset
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        ids = set()
+        for slug in self._split_slugs(value):
+            category = categories.get_by_slug(slug)
+            if category is not None:
+                ids.add(category.id)
+        if not ids:
+            return queryset.none()
+        return queryset.filter(category_id__in=ids)
+
+    def filter_name_prefix(self, queryset, name, value):
+        value = value.strip().lower()
+        if not value:
+            return queryset
+        return queryset.filter(prefix_q('name_lower', value))
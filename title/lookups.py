@@ -0,0 +1,89 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Category, Genre
+
+
+class LookupTable:
+    """
+    Все объекты небольшой, почти неизменной модели (Genre, Category)
+    в памяти процесса, с поиском по id и slug без запросов к базе.
+    Актуальность проверяется по общей для воркеров версии в кэше
+    не чаще раза в settings.LOOKUP_CHECK_INTERVAL секунд; при изменении
+    модели версия сбрасывается (invalidate), и таблица перечитывается.
+    Если объекта нет и после проверки версии (например, версию сбросил
+    другой воркер с отдельным кэшем), его наличие проверяется запросом
+    к базе, и найденный объект перечитывает таблицу.
+    """
+    # Поле модели для поиска по индексу таблицы (_state[1], _state[2]).
+    index_fields = {1: 'id', 2: 'slug'}
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f'lookup:version:{model._meta.label_lower}'
+        self._state = (None, {}, {})
+        self._checked = 0.0
+
+    def _get_cache(self):
+        return caches[settings.LOOKUP_CACHE]
+
+    def _shared_version(self):
+        cache = self._get_cache()
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def _load(self, version):
+        objects = list(self.model.objects.all())
+        self._state = (
+            version,
+            {obj.id: obj for obj in objects},
+            {obj.slug: obj for obj in objects},
+        )
+
+    def _get_state(self, force_check=False):
+        now = time.monotonic()
+        if (force_check or self._state[0] is None
+                or now - self._checked >= settings.LOOKUP_CHECK_INTERVAL):
+            version = self._shared_version()
+            self._checked = now
+            if version != self._state[0]:
+                self._load(version)
+        return self._state
+
+    def _get(self, index, key):
+        obj = self._get_state()[index].get(key)
+        if obj is None:
+            obj = self._get_state(force_check=True)[index].get(key)
+        if obj is None and self.model.objects.filter(
+            **{self.index_fields[index]: key}
+        ).exists():
+            self._load(self._state[0])
+            obj = self._state[index].get(key)
+        return obj
+
+    def get_by_id(self, pk):
+        return self._get(1, pk)
+
+    def get_by_slug(self, slug):
+        return self._get(2, slug)
+
+    def all(self):
+        return list(self._get_state()[1].values())
+
+    def invalidate(self):
+        """
+        Сбрасывает общую версию и локальную таблицу:
+        все воркеры перечитают таблицу при следующей проверке.
+        """
+        self._get_cache().delete(self.version_key)
+        self._state = (None, {}, {})
+
+
+genres = LookupTable(Genre)
+categories = LookupTable(Category)
@@ -0,0 +1,19 @@
+# Generated by Django 3.0.5 on 2026-10-19 16:47
+
+from django.db import migrations, models
+import title.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('title', '0009_auto_20210331_0005'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.PositiveSmallIntegerField(default=0, validators=[title.validators.validate_year], verbose_name='Год'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import Avg
+
+import title.validators
+
+
+def fill_search_columns(apps, schema_editor):
+    Title = apps.get_model('title', 'Title')
+    Review = apps.get_model('review', 'Review')
+    ratings = dict(
+        Review.objects.order_by().values('title_id').annotate(
+            average=Avg('score')
+        ).values_list('title_id', 'average')
+    )
+    for title in Title.objects.all().iterator():
+        title.name_lower = title.name.lower()
+        title.rating = ratings.get(title.id)
+        title.save(update_fields=('name_lower', 'rating'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0010_merge_20210331_0000'),
+        ('title', '0010_title_year_validator'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='name_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=200, verbose_name='Название в нижнем регистре'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(db_index=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, validators=[title.validators.validate_year], verbose_name='Год'),
+        ),
+        migrations.RunPython(fill_search_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.0.5 on 2026-10-19 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('title', '0012_similartitle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyTitle',
+            fields=[
+                ('title_id', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='id произведения')),
+                ('first_marked', models.DateTimeField(verbose_name='Первая отметка')),
+                ('last_marked', models.DateTimeField(verbose_name='Последняя отметка')),
+            ],
+            options={
+                'verbose_name': 'Произведение с устаревшим рейтингом',
+                'verbose_name_plural': 'Произведения с устаревшим рейтингом',
+            },
+        ),
+    ]
@@ -1,9 +1,9 @@
 import textwrap
-from datetime import date
 
-from django.core.validators import MaxValueValidator
 from django.db import models
 
+from .validators import validate_year
+
 
 class Title(models.Model):
     """
@@ -16,16 +16,29 @@ class Title(models.Model):
     category - 'Категория', внешний ключ на модель Category, необязательное.
     genre - 'Жанр', внешний ключ на модель Genre, множественное,
     необязательное.
+    name_lower - название в нижнем регистре для поиска по началу названия
+    без учета регистра, заполняется при сохранении.
+    rating - средняя оценка отзывов, пересчитывается при изменении отзывов
+    (api.ratings), None если отзывов нет. Сохранение существующего
+    произведения без update_fields не записывает rating, чтобы
+    не затереть пересчитанное значение.
     Сортровка - primary key.
     """
     name = models.CharField(
         max_length=200,
         verbose_name='Название произведения'
     )
+    name_lower = models.CharField(
+        max_length=200,
+        editable=False,
+        db_index=True,
+        verbose_name='Название в нижнем регистре'
+    )
     year = models.PositiveSmallIntegerField(
         default=0,
         verbose_name='Год',
-        validators=[MaxValueValidator(date.today().year)]
+        validators=[validate_year],
+        db_index=True
     )
     description = models.TextField(
         blank=True,
@@ -45,6 +58,12 @@ class Title(models.Model):
         blank=True,
         verbose_name='Жанры'
     )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Рейтинг'
+    )
 
     class Meta:
         verbose_name = 'Произведение'
@@ -54,6 +73,18 @@ class Title(models.Model):
     def __str__(self):
         return textwrap.shorten(self.name, 15, placeholder='...')
 
+    def save(self, *args, **kwargs):
+        self.name_lower = self.name.lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'rating'
+            ]
+        elif update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_lower'}
+        super().save(*args, **kwargs)
+
 
 class Category(models.Model):
     """
@@ -101,3 +132,67 @@ class Genre(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class SimilarTitle(models.Model):
+    """
+    Модель SimilarTitle(Похожее произведение).
+    Заполняется командой build_similar_titles (api.similarity).
+    Поля:
+    title - 'Произведение', внешний ключ на модель Title.
+    similar - 'Похожее произведение', внешний ключ на модель Title.
+    score - 'Сходство', косинусная мера по оценкам отзывов.
+    Сортировка - по убыванию сходства.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='Произведение'
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Похожее произведение'
+    )
+    score = models.FloatField(verbose_name='Сходство')
+
+    class Meta:
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        ordering = ('title', '-score')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'similar'), name='unique_similar_title'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id} ~ {self.similar_id}: {self.score:.3f}'
+
+
+class DirtyTitle(models.Model):
+    """
+    Модель DirtyTitle(Произведение с устаревшим рейтингом).
+    Заполняется при изменении отзывов, если рейтинг пересчитывается
+    отложенно (settings.RATING_UPDATE_MODE = 'deferred', api.ratings).
+    Поля:
+    title_id - id произведения, первичный ключ. Не внешний ключ,
+    чтобы отметка не мешала удалению произведения.
+    first_marked - время первой отметки после последнего пересчета.
+    last_marked - время последней отметки.
+    """
+    title_id = models.PositiveIntegerField(
+        primary_key=True,
+        verbose_name='id произведения'
+    )
+    first_marked = models.DateTimeField(verbose_name='Первая отметка')
+    last_marked = models.DateTimeField(verbose_name='Последняя отметка')
+
+    class Meta:
+        verbose_name = 'Произведение с устаревшим рейтингом'
+        verbose_name_plural = 'Произведения с устаревшим рейтингом'
+
+    def __str__(self):
+        return str(self.title_id)
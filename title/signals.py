@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .lookups import categories, genres
+from .models import Category, Genre
+
+
+# Таблицы сбрасываются после COMMIT, иначе другой воркер успел бы
+# перечитать их без изменения под новой версией.
+def invalidate_genres(sender, **kwargs):
+    transaction.on_commit(genres.invalidate)
+
+
+def invalidate_categories(sender, **kwargs):
+    transaction.on_commit(categories.invalidate)
+
+
+post_save.connect(invalidate_genres, sender=Genre)
+post_delete.connect(invalidate_genres, sender=Genre)
+post_save.connect(invalidate_categories, sender=Category)
+post_delete.connect(invalidate_categories, sender=Category)
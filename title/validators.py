@@ -0,0 +1,15 @@
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+
+def validate_year(value):
+    """
+    Год произведения не может быть больше текущего.
+    Текущий год вычисляется при каждой проверке, поэтому граница
+    не устаревает в долго работающих воркерах и не попадает в миграции.
+    """
+    current_year = timezone.now().year
+    if value > current_year:
+        raise ValidationError(
+            f'Год не может быть больше текущего ({current_year}).'
+        )
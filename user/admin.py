@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from api.deletion import bulk_delete_action, delete_user
 from user.models import User
 
 
@@ -9,3 +10,6 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ('last_login', 'date_joined',)
     readonly_fields = ('last_login', 'date_joined',)
     empty_value_display = '-empty-'
+    actions = (bulk_delete_action(
+        delete_user, 'Удалить вместе с отзывами и комментариями (пакетно)'
+    ),)
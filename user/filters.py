@@ -0,0 +1,24 @@
+from rest_framework.filters import BaseFilterBackend
+
+from api_yamdb.queries import prefix_q
+
+
+class UserSearchFilter(BaseFilterBackend):
+    """
+    Поиск пользователей по началу username или email (параметр `search`)
+    без учета регистра. В отличие от SearchFilter (LIKE '%x%'),
+    поиск по префиксу использует индексы полей username_lower
+    и email_lower.
+    Если в строке поиска есть '@', ищется только по email.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip().lower()
+        if not term:
+            return queryset
+        if '@' in term:
+            return queryset.filter(prefix_q('email_lower', term))
+        return queryset.filter(
+            prefix_q('username_lower', term) | prefix_q('email_lower', term)
+        )
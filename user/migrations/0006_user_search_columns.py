@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+def fill_search_columns(apps, schema_editor):
+    User = apps.get_model('user', 'User')
+    for user in User.objects.all().iterator():
+        user.username_lower = user.username.lower()
+        user.email_lower = user.email.lower()
+        user.save(update_fields=('username_lower', 'email_lower'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_user_email_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150, verbose_name='username в нижнем регистре'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=254, verbose_name='email в нижнем регистре'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_search_columns, migrations.RunPython.noop),
+    ]
@@ -15,8 +15,29 @@ class User(AbstractUser):
     """
     Модель User(Пользователи),
     на основе встроенной Django-модели AbstractUser,
-    дополненная полями bio и role
+    дополненная полями bio и role.
+    Поле email проиндексировано для входа по email.
+    Поля username_lower и email_lower - username и email в нижнем
+    регистре, заполняются при сохранении; по ним с индексом ищется
+    начало username и email без учета регистра.
     """
+    email = models.EmailField(
+        blank=True,
+        db_index=True,
+        verbose_name='email address'
+    )
+    username_lower = models.CharField(
+        max_length=150,
+        editable=False,
+        db_index=True,
+        verbose_name='username в нижнем регистре'
+    )
+    email_lower = models.CharField(
+        max_length=254,
+        editable=False,
+        db_index=True,
+        verbose_name='email в нижнем регистре'
+    )
     bio = models.CharField(
         max_length=200,
         blank=True,
@@ -37,6 +58,20 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    # Поля, которые пересчитываются из исходного при сохранении.
+    LOWER_FIELDS = {'username': 'username_lower', 'email': 'email_lower'}
+
+    def save(self, *args, **kwargs):
+        self.username_lower = self.username.lower()
+        self.email_lower = self.email.lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *(
+                lower for field, lower in self.LOWER_FIELDS.items()
+                if field in update_fields
+            )}
+        super().save(*args, **kwargs)
+
     @property
     def is_admin(self):
         return (self.role == YamdbRoles.ADMIN
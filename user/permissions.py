@@ -1,19 +1,82 @@
+from collections import namedtuple
+
+from django.db.models import BooleanField, Case, Value, When
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
+RoleCapabilities = namedtuple(
+    'RoleCapabilities',
+    ('user_id', 'is_authenticated', 'is_admin', 'can_moderate')
+)
+
+ANONYMOUS_CAPABILITIES = RoleCapabilities(None, False, False, False)
+
+
+def get_capabilities(request):
+    """
+    Возвращает права текущего пользователя (RoleCapabilities).
+    Вычисляются один раз за запрос и кэшируются на объекте request,
+    поэтому повторные проверки не перечитывают роль пользователя.
+    """
+    capabilities = getattr(request, '_yamdb_capabilities', None)
+    if capabilities is None:
+        user = request.user
+        if user and user.is_authenticated:
+            is_admin = user.is_admin
+            capabilities = RoleCapabilities(
+                user_id=user.pk,
+                is_authenticated=True,
+                is_admin=is_admin,
+                can_moderate=is_admin or user.is_moderator
+            )
+        else:
+            capabilities = ANONYMOUS_CAPABILITIES
+        request._yamdb_capabilities = capabilities
+    return capabilities
+
+
+def can_edit(request, obj):
+    """
+    Может ли текущий пользователь изменять объект с полем author.
+    Сравнивает author_id, не загружая автора из базы.
+    """
+    capabilities = get_capabilities(request)
+    return capabilities.is_authenticated and (
+        capabilities.can_moderate
+        or obj.author_id == capabilities.user_id
+    )
+
+
+def annotate_can_edit(queryset, request):
+    """
+    Добавляет к queryset аннотацию can_edit для каждого объекта
+    одним выражением в SQL, без запросов на каждый объект.
+    """
+    capabilities = get_capabilities(request)
+    if not capabilities.is_authenticated or capabilities.can_moderate:
+        return queryset.annotate(can_edit=Value(
+            capabilities.can_moderate,
+            output_field=BooleanField()
+        ))
+    return queryset.annotate(can_edit=Case(
+        When(author_id=capabilities.user_id, then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField()
+    ))
+
 
 class IsAdmin(BasePermission):
     message = 'Только Администратор имеет права на эти действия'
 
     def has_permission(self, request, view):
-        return (request.user.is_authenticated and request.user.is_admin)
+        return get_capabilities(request).is_admin
 
 
 class IsAdminOrReadOnly(BasePermission):
     message = 'Только Администратор имеет права на эти действия'
 
     def has_permission(self, request, view):
-        return (request.method in SAFE_METHODS or (
-                request.user.is_authenticated and request.user.is_admin))
+        return (request.method in SAFE_METHODS
+                or get_capabilities(request).is_admin)
 
 
 class IsAuthorOrAdminOrModerator(BasePermission):
@@ -21,10 +84,8 @@ class IsAuthorOrAdminOrModerator(BasePermission):
                'имеют права на эти действия')
 
     def has_permission(self, request, view):
-        return (request.method in SAFE_METHODS or (
-                request.user and request.user.is_authenticated))
+        return (request.method in SAFE_METHODS
+                or get_capabilities(request).is_authenticated)
 
     def has_object_permission(self, request, view, obj):
-        return (request.method in SAFE_METHODS or request.user.is_authenticated
-                and (request.user.is_admin or request.user.is_moderator
-                     or obj.author == request.user))
+        return request.method in SAFE_METHODS or can_edit(request, obj)